@@ -0,0 +1,66 @@
+"""
+基准: 逐行解析 JSON / Python 字面量 (repr) 的吞吐量。
+
+对比:
+  - reference:         引入 LineDecoder 之前的 _safe_json_load, 先 json.loads, 失败再 ast.literal_eval;
+  - LineDecoder(json): 只用标准库 json, 但按文件粘性选择解析器;
+  - LineDecoder(auto): 优先使用已安装的 orjson / msgspec。
+两种输入分别为 JSON 行和 repr 行, 解析结果会先与 reference 比对。orjson / msgspec 未安装时 auto 等同于 json。
+
+运行 (在仓库根目录):
+    python benchmarks/bench_line_decoder.py [--rows 50000]
+"""
+import argparse
+import ast
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mignonFramework.utils.reader.LineDecoder import LineDecoder  # noqa: E402
+
+
+def reference_load(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError, MemoryError, TypeError):
+            return None
+
+
+def _measure(func, lines):
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    rows = [{'id': i, 'name': f'n{i}' * 3, 'score': random.random(), 'ok': i % 2 == 0, 'none': None,
+             'tags': ['a', 'b'], 'nested': {'x': i}} for i in range(args.rows)]
+    inputs = [('JSON lines', [json.dumps(row, ensure_ascii=False) + '\n' for row in rows]),
+              ('repr lines', [repr(row) + '\n' for row in rows])]
+
+    auto_backend = LineDecoder('auto').backend
+    print(f"{args.rows} 行, auto 后端: {auto_backend}")
+    print(f"{'input':12s} {'reference':>14s} {'json':>14s} {'auto':>14s}")
+    for label, lines in inputs:
+        for line in lines[:100]:
+            assert LineDecoder('auto').decode_or_none(line) == reference_load(line), line
+        before = _measure(reference_load, lines)
+        results = [_measure(LineDecoder(backend).decode_or_none, lines) for backend in ('json', 'auto')]
+        print(f"{label:12s} {before:>10,.0f} r/s" + ''.join(f" {rate:>10,.0f} r/s" for rate in results))
+
+
+if __name__ == '__main__':
+    main()
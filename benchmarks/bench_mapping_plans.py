@@ -0,0 +1,122 @@
+"""
+基准: GenericFileProcessor 逐行映射 (_process_single_item) 的吞吐量。
+
+对比两种实现:
+  - reference: 改用映射计划之前的逐行算法, 每一行的每个键都重新做两次 re.sub 转 snake_case,
+               并在每一行重新合并排除集合;
+  - plan:      当前实现, 按键集合缓存 _MappingPlan, 每行只做一次字典推导。
+两者的输出会先逐行比对, 确认一致后再计时。无需数据库, 写入器为空实现。
+
+运行 (在仓库根目录):
+    python benchmarks/bench_mapping_plans.py [--rows 5000] [--columns 200]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mignonFramework.utils.GenericProcessor import GenericFileProcessor, Rename  # noqa: E402
+from mignonFramework.utils.writer.BaseWriter import BaseWriter  # noqa: E402
+
+
+class _NullWriter(BaseWriter):
+    def upsert_batch(self, data_list, table_name, test=False):
+        return True
+
+    def upsert_single(self, data_dict, table_name, test=False):
+        return True
+
+
+def _uncached_snake_case(name):
+    if not isinstance(name, str) or not name:
+        return ""
+    name = name.strip('`')
+    s1 = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+def reference_process(processor, json_data):
+    """映射计划之前的逐行实现 (modifier_stdout='direct' 时的语义)。"""
+    current_excludes = processor.exclude_keys.union(set())
+    data_with_defaults = {**json_data}
+    for key, default_value in processor.default_values.items():
+        if data_with_defaults.get(key) in (None, ''):
+            data_with_defaults[key] = default_value
+
+    processed_data = {}
+    if processor.include_keys is not None:
+        for original_key, value in data_with_defaults.items():
+            snake_case_key = _uncached_snake_case(original_key)
+            if snake_case_key in processor.include_keys:
+                processed_data[snake_case_key] = value
+    else:
+        for original_key, value in data_with_defaults.items():
+            if original_key not in current_excludes:
+                processed_data[_uncached_snake_case(original_key)] = value
+
+    if processor.modifier_function:
+        for original_src_key, instruction in processor.modifier_function(data_with_defaults).items():
+            if isinstance(instruction, Rename):
+                target_key_for_patch = instruction.new_key_name
+                value_for_patch = data_with_defaults.get(original_src_key)
+            elif isinstance(instruction, tuple) and len(instruction) == 2:
+                target_key_for_patch, value_for_patch = instruction
+            else:
+                target_key_for_patch = _uncached_snake_case(original_src_key)
+                value_for_patch = instruction
+            if target_key_for_patch is not None and (
+                    processor.include_keys is None or target_key_for_patch in processor.include_keys):
+                if (target_key_for_patch != _uncached_snake_case(original_src_key)
+                        and _uncached_snake_case(original_src_key) in processed_data):
+                    del processed_data[_uncached_snake_case(original_src_key)]
+                processed_data[target_key_for_patch] = value_for_patch
+
+    return processor._finalize_types(processed_data)
+
+
+def _modifier(data):
+    return {'someColumnName1': Rename('renamed'), 'someColumnName2': data['someColumnName2'] * 2}
+
+
+def _measure(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--columns', type=int, default=200)
+    args = parser.parse_args()
+
+    template = {f'someColumnName{i}': (i if i % 3 else f'value {i}') for i in range(args.columns)}
+    rows = [dict(template) for _ in range(args.rows)]
+    configs = [
+        ('plain', {}),
+        ('exclude+defaults', {'exclude_keys': ['someColumnName5'], 'default_values': {'someColumnName7': 0}}),
+        ('include_keys', {'include_keys': [f'some_column_name{i}' for i in range(0, args.columns, 2)]}),
+        ('modifier', {'modifier_function': _modifier}),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, 'empty.json')
+        open(data_path, 'w').close()
+        print(f"{args.rows} 行 x {args.columns} 列")
+        print(f"{'config':18s} {'reference':>14s} {'plan':>14s} {'speedup':>8s}")
+        for label, kwargs in configs:
+            processor = GenericFileProcessor(data_path, writer=_NullWriter(), table_name='bench',
+                                             modifier_stdout='direct', **kwargs)
+            assert processor._process_single_item(rows[0]) == reference_process(processor, rows[0]), label
+            before = _measure(lambda row: reference_process(processor, row), rows)
+            after = _measure(processor._process_single_item, rows)
+            print(f"{label:18s} {before:>10,.0f} r/s {after:>10,.0f} r/s {after / before:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+基准: MysqlManager 构建 UPSERT 语句与提取行值的开销 (不连接数据库)。
+
+对比:
+  - reference: 缓存之前的做法, 每次 upsert_single 调用都重新拼接 INSERT ... ON DUPLICATE KEY UPDATE 语句,
+               并用 tuple(data.get(col) for col in columns) 取值;
+  - cached:    当前实现, 按 (表名, 列元组) 从 LRU 缓存取出语句与 operator.itemgetter。
+语句文本与取值结果会先与 reference 比对。
+
+运行 (在仓库根目录, 需要已安装 pymysql):
+    python benchmarks/bench_upsert_statements.py [--calls 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mignonFramework.utils.writer.MySQLManager import _row_values, _upsert_statement  # noqa: E402
+
+
+def reference_single(data_dict, table_name):
+    columns = list(data_dict.keys())
+    update_columns = [col for col in columns if col.lower() not in ['id', 'create_time']]
+    sql = f"""
+            INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            ON DUPLICATE KEY UPDATE {', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)}
+        """
+    return sql, tuple(data_dict.get(col) for col in columns)
+
+
+def cached_single(data_dict, table_name):
+    columns = tuple(data_dict)
+    sql, getter = _upsert_statement(table_name, columns)
+    return sql, getter(data_dict)
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'columns':8s} {'reference':>16s} {'cached':>16s} {'speedup':>8s}")
+    for width in (1, 5, 30):
+        row = {('id' if i == 0 else f'col_{i}'): i for i in range(width)}
+        assert reference_single(row, 'bench') == cached_single(row, 'bench')
+        before = args.calls / _timed(lambda: reference_single(row, 'bench'), args.calls)
+        after = args.calls / _timed(lambda: cached_single(row, 'bench'), args.calls)
+        print(f"{width:<8d} {before:>10,.0f} stmt/s {after:>10,.0f} stmt/s {after / before:>7.1f}x")
+
+    rows = [{f'c{i}': j for i in range(30)} for j in range(1000)]
+    columns = tuple(rows[0])
+    _, getter = _upsert_statement('bench', columns)
+    assert _row_values(getter, columns, rows) == [tuple(d.get(c) for c in columns) for d in rows]
+    before = _timed(lambda: [tuple(d.get(c) for c in columns) for d in rows], 200) / 200
+    after = _timed(lambda: _row_values(getter, columns, rows), 200) / 200
+    print(f"1000x30 批次取值: reference {before * 1e3:.2f}ms, cached {after * 1e3:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -41,16 +41,21 @@ if TYPE_CHECKING:
     from mignonFramework.utils.GenericProcessor import GenericFileProcessor as InsertQuick, Rename
     from mignonFramework.utils.ProcessFile import run as processRun
     from mignonFramework.utils.writer.MySQLManager import MysqlManager
+    from mignonFramework.utils.writer.MySQLLoadDataWriter import MySQLLoadDataWriter
+    from mignonFramework.utils.writer.AsyncMySQLManager import AsyncMySQLManager
     from mignonFramework.utils.reader.BaseReader import BaseReader
     from mignonFramework.utils.writer.BaseWriter import BaseWriter
     from mignonFramework.utils.config.ConfigReader import ConfigManager, inject
     from mignonFramework.utils.execJS.execJSTo import execJS
     from mignonFramework.utils.mignonFramework_starter import start
     from mignonFramework.utils.utilClass.JSONFormatter import JSONFormatter
+    from mignonFramework.utils.utilClass.ProgressReporter import ProgressReporter
+    from mignonFramework.utils.utilClass.AdaptiveBatchSizer import AdaptiveBatchSizer
     from mignonFramework.utils.utilClass.SqlDDL2List import extract_column_names_from_ddl as extractDDL2List
     from mignonFramework.utils.utilClass.getJSONequals import jsonContrast
     from mignonFramework.utils.execJS.MicroserviceByNodeJS import MicroServiceByNodeJS
     from mignonFramework.utils.config.JsonlConfigReader import JsonConfigManager, injectJson, ClassKey
+    from mignonFramework.utils.config.CheckpointStore import CheckpointStore
     from mignonFramework.utils.utilClass.printDirectoryTree import print_directory_tree as printDirectoryTree
     from mignonFramework.utils.dataBaseTransfer import DatabaseTransferRunner, AbstractDatabaseTransfer, TransferConfig
     from mignonFramework.utils.Louru_Plus import LoguruPlus, SendLog
@@ -85,6 +90,8 @@ __lazy_mapping__ = {
     'injectSQLite': ('mignonFramework.utils.config.SQLiteTracker', 'injectSQLite'),
     'VarChar': ('mignonFramework.utils.config.SQLiteTracker', 'VarChar'),
     'MysqlManager': ('mignonFramework.utils.writer.MySQLManager', 'MysqlManager'),
+    'MySQLLoadDataWriter': ('mignonFramework.utils.writer.MySQLLoadDataWriter', 'MySQLLoadDataWriter'),
+    'AsyncMySQLManager': ('mignonFramework.utils.writer.AsyncMySQLManager', 'AsyncMySQLManager'),
     'BaseReader': ('mignonFramework.utils.reader.BaseReader', 'BaseReader'),
     'BaseWriter': ('mignonFramework.utils.writer.BaseWriter', 'BaseWriter'),
     'ConfigManager': ('mignonFramework.utils.config.ConfigReader', 'ConfigManager'),
@@ -92,9 +99,12 @@ __lazy_mapping__ = {
     'execJS': ('mignonFramework.utils.execJS.execJSTo', 'execJS'),
     'start': ('mignonFramework.utils.mignonFramework_starter', 'start'),
     'JSONFormatter': ('mignonFramework.utils.utilClass.JSONFormatter', 'JSONFormatter'),
+    'ProgressReporter': ('mignonFramework.utils.utilClass.ProgressReporter', 'ProgressReporter'),
+    'AdaptiveBatchSizer': ('mignonFramework.utils.utilClass.AdaptiveBatchSizer', 'AdaptiveBatchSizer'),
     'jsonContrast': ('mignonFramework.utils.utilClass.getJSONequals', 'jsonContrast'),
     'MicroServiceByNodeJS': ('mignonFramework.utils.execJS.MicroserviceByNodeJS', 'MicroServiceByNodeJS'),
     'JsonConfigManager': ('mignonFramework.utils.config.JsonlConfigReader', 'JsonConfigManager'),
+    'CheckpointStore': ('mignonFramework.utils.config.CheckpointStore', 'CheckpointStore'),
     'DatabaseTransferRunner': ('mignonFramework.utils.dataBaseTransfer', 'DatabaseTransferRunner'),
     'AbstractDatabaseTransfer': ('mignonFramework.utils.dataBaseTransfer', 'AbstractDatabaseTransfer'),
     'TransferConfig': ('mignonFramework.utils.dataBaseTransfer', 'TransferConfig'),
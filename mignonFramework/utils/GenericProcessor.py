@@ -1,17 +1,37 @@
 import json as std_json
 import os
-import sys
 import io
+import sys
 import re
+import pickle
+import multiprocessing
+import queue
+import threading
+import time
+import asyncio
+import inspect
+import functools
+import operator
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import redirect_stdout
 from datetime import datetime
-from typing import Dict, Callable, List, Optional, Any, Set, Tuple
+from typing import Dict, Callable, List, Optional, Any, Set, Tuple, Union
 
 from mignonFramework.utils.writer.MySQLManager import MysqlManager
 from mignonFramework.utils.config.ConfigReader import ConfigManager
 from mignonFramework.utils.writer.BaseWriter import BaseWriter
+from mignonFramework.utils.writer.CircuitBreaker import call_when_available
+from mignonFramework.utils.writer.ErrorIsolation import SKIP, SKIP_REST, bisect_write, bisect_write_async
 from mignonFramework.utils.reader.BaseReader import BaseReader
 from mignonFramework.utils.reader.JSONLineReader import JsonLineReader
+from mignonFramework.utils.utilClass.ProgressReporter import ProgressReporter
+from mignonFramework.utils.utilClass.AdaptiveBatchSizer import AdaptiveBatchSizer, estimate_rows_bytes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class CallbackException(Exception):
@@ -26,6 +46,135 @@ class Rename:
         self.new_key_name = new_key_name
 
 
+def _encode_nested(value, compact: bool = False) -> str:
+    """
+    将嵌套的 dict/list 编码为JSON字符串, 默认使用标准库, 输出格式与以往写入的数据一致 (如 {"a": [0]})。
+    compact=True 且安装了 orjson 时改用 orjson: 速度更快, 但输出为紧凑格式 ({"a":[0]}), NaN/Infinity 写为 null;
+    orjson 无法处理的值 (如超过 64 位的整数) 回退到标准库。
+    """
+    if compact and orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass
+    return std_json.dumps(value, ensure_ascii=False)
+
+
+# 多个写入线程同时定位到错误行时, 逐个输出错误信息并请求用户输入
+_PROMPT_LOCK = threading.Lock()
+
+
+def _prompt_stream():
+    """
+    错误行提示使用的输出流。
+    主线程屏蔽 modifier 输出 (redirect_stdout 到 StringIO) 期间, 写入线程的提示改为直接写入控制台, 否则用户看不到提示。
+    """
+    stdout = sys.stdout
+    if isinstance(stdout, io.StringIO):
+        return sys.__stdout__
+    return stdout
+
+
+@functools.lru_cache(maxsize=65536)
+def _snake_case(name: str) -> str:
+    name = name.strip('`')
+    s1 = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', name)
+    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+class _MappingPlan:
+    """
+    针对一组固定键集合预先编译好的映射计划。
+    保存需要应用的默认值, 以及经过 include/exclude 决策后的 (源键, 目标键) 对,
+    逐行处理时只需一次字典推导。
+    """
+    __slots__ = ('defaults', 'pairs')
+
+    def __init__(self, defaults: Tuple[Tuple[str, Any], ...], pairs: Tuple[Tuple[Any, str], ...]):
+        self.defaults = defaults
+        self.pairs = pairs
+
+
+class _BatchWriterPipeline:
+    """
+    写入流水线: 主循环把组装好的批次放入有界队列, 后台写入线程取出后调用 _execute_batch。
+    队列满时主循环阻塞, 以此形成背压; 写入线程中的首个异常会在主线程下一次提交或等待时重新抛出。
+    多个写入线程时批次的完成顺序不确定, 因此每个批次按提交顺序编号, callBack 先暂存,
+    只在之前的批次全部写入完成后才按顺序触发, 断点行号不会越过尚未写入的批次。
+    """
+
+    def __init__(self, processor: 'GenericFileProcessor', threads: int, queue_size: int):
+        self._processor = processor
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._error: Optional[BaseException] = None
+        self._submitted = 0
+        self._next_to_report = 0
+        self._completed: Dict[int, List[tuple]] = {}
+        self._report_lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._loop, name=f"mignon-writer-{i}", daemon=True)
+                         for i in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    sequence, data_tuples, filename = item
+                    reported: List[tuple] = []
+                    callback = (lambda *args: reported.append(args)) if self._processor.callBack else None
+                    self._processor._execute_batch(data_tuples, filename, callback)
+                    self._report(sequence, reported)
+            except BaseException as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _report(self, sequence: int, reported: List[tuple]):
+        """记录批次完成, 并按提交顺序触发所有之前批次均已完成的批次的 callBack。"""
+        with self._report_lock:
+            self._completed[sequence] = reported
+            while self._next_to_report in self._completed:
+                for args in self._completed.pop(self._next_to_report):
+                    self._processor.callBack(*args)
+                self._next_to_report += 1
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, data_tuples: List[Tuple[Dict, int]], filename: str):
+        sequence = self._submitted
+        self._submitted += 1
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put((sequence, data_tuples, filename), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def drain(self):
+        """等待队列中所有批次写入完成。"""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self, raise_errors: bool = True):
+        """
+        停止写入线程。raise_errors 为 False 时 (调用方已有正在传播的异常) 不再抛出写入线程的异常, 避免覆盖原始异常。
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if raise_errors:
+            self._raise_if_failed()
+
+
 class GenericFileProcessor:
     """
     一个通用的、可定制的逐行文件处理器，用于将文件内容批量写入指定目标。
@@ -47,7 +196,16 @@ class GenericFileProcessor:
                  print_mapping_table: bool = True,
                  on_error: str = 'stop',
                  eazy: bool = False,
-                 auto_skip_error: bool = False):
+                 auto_skip_error: bool = False,
+                 workers: int = 1,
+                 chunk_bytes: int = 8 * 1024 * 1024,
+                 writer_threads: int = 0,
+                 write_queue_size: int = 4,
+                 modifier_stdout: str = 'row',
+                 batch_modifier_function: Optional[Callable[[List[Dict]], List[Dict]]] = None,
+                 bulk_insert: bool = False,
+                 adaptive_batch: Union[bool, AdaptiveBatchSizer] = False,
+                 compact_json: bool = False):
         self.is_ready = True
         self.config_manager = ConfigManager(filename='./resources/config/generic.ini', section='GenericProcessor')
         self.test = False
@@ -82,6 +240,35 @@ class GenericFileProcessor:
         self.print_mapping_table = print_mapping_table
         self.on_error = on_error
         self.auto_skip_error = auto_skip_error
+        # workers > 1 时启用多进程解析/转换, 文件按 chunk_bytes 切分为字节区间分发给子进程
+        self.workers = max(1, int(workers or 1))
+        self.chunk_bytes = chunk_bytes
+        # writer_threads > 0 时由后台线程写入, 主循环只负责读取和转换; 多于 1 个线程时 writer 必须是线程安全的
+        self.writer_threads = max(0, int(writer_threads or 0))
+        self.write_queue_size = write_queue_size
+        self._write_pipeline: Optional[_BatchWriterPipeline] = None
+        self._mapping_plans: Dict[frozenset, _MappingPlan] = {}
+        # modifier 的标准输出屏蔽方式: 'row' 每行重定向一次 (默认), 'batch' 每批次重定向一次, 'direct' 不做重定向
+        if modifier_stdout not in ('row', 'batch', 'direct'):
+            raise ValueError("modifier_stdout 只能是 'row', 'batch' 或 'direct'。")
+        self.modifier_stdout = modifier_stdout
+        self.batch_modifier_function = batch_modifier_function
+        # adaptive_batch 为 True (或传入自定义的 AdaptiveBatchSizer) 时, 根据实测写入耗时自动调整每批写入的行数
+        if isinstance(adaptive_batch, AdaptiveBatchSizer):
+            self.batch_sizer: Optional[AdaptiveBatchSizer] = adaptive_batch
+        elif adaptive_batch:
+            self.batch_sizer = AdaptiveBatchSizer(initial=batch_size)
+        else:
+            self.batch_sizer = None
+        # bulk_insert 为 True 时让支持该模式的 writer (如 MysqlManager) 使用多行 VALUES 语句写入
+        self.bulk_insert = bulk_insert
+        if bulk_insert and self.writer is not None:
+            if hasattr(self.writer, 'bulk_insert'):
+                self.writer.bulk_insert = True
+            else:
+                print(f"[WARNING] {type(self.writer).__name__} 不支持 bulk_insert, 该参数将被忽略。")
+        # compact_json 为 True 时嵌套的 dict/list 用 orjson 编码为紧凑 JSON (需要安装 orjson), 默认与标准库输出一致
+        self.compact_json = compact_json
 
     def _init_from_config(self):
         config_data = self.config_manager.getAllConfig()
@@ -155,53 +342,103 @@ class GenericFileProcessor:
     def _to_snake_case(self, name: str) -> str:
         if not isinstance(name, str) or not name:
             return ""
-        name = name.strip('`')
-        s1 = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', name)
-        return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        return _snake_case(name)
 
     def _finalize_types(self, data_dict: dict) -> dict:
         final_data = {}
         for key, value in data_dict.items():
-            if value is None or (isinstance(value, str) and value.strip() == ''):
+            if value is None or (isinstance(value, str) and (not value or value.isspace())):
                 final_data[key] = None
             elif isinstance(value, (dict, list)):
-                final_data[key] = std_json.dumps(value, ensure_ascii=False)
+                final_data[key] = _encode_nested(value, self.compact_json)
             else:
                 final_data[key] = value
         return final_data
 
+    @staticmethod
+    def _finalize_batch(mapped: List[Tuple[Dict, int]], compact_json: bool = False) -> List[Tuple[Dict, int]]:
+        """
+        按列对整批记录做类型收尾, 结果与逐条调用 _finalize_types 一致。
+        先以 C 层的 map 统计每列在本批中出现的值类型: 从未出现字符串的列不做空白检查,
+        从未出现 dict/list 的列不做编码, 纯数值/None 的列完全不逐值处理。
+        """
+        rows = [dict(item) for item, _ in mapped]
+        for column in set().union(*rows):
+            kinds = set(map(type, map(operator.methodcaller('get', column), rows)))
+            has_str = any(issubclass(kind, str) for kind in kinds)
+            has_nested = any(issubclass(kind, (dict, list)) for kind in kinds)
+            if not (has_str or has_nested):
+                continue
+            for row in rows:
+                value = row.get(column)
+                if has_str and isinstance(value, str):
+                    if not value or value.isspace():
+                        row[column] = None
+                elif has_nested and isinstance(value, (dict, list)):
+                    row[column] = _encode_nested(value, compact_json)
+        return [(row, line_num) for row, (_, line_num) in zip(rows, mapped) if row]
+
+    _MAX_MAPPING_PLANS = 1024
+
+    def _build_mapping_plan(self, keys, excludes: Set[str], default_values: Dict[str, Any]) -> _MappingPlan:
+        all_keys = list(keys) + [k for k in default_values if k not in keys]
+        if self.include_keys is not None:
+            pairs = tuple((k, target) for k in all_keys
+                          if (target := self._to_snake_case(k)) in self.include_keys)
+        else:
+            pairs = tuple((k, self._to_snake_case(k)) for k in all_keys if k not in excludes)
+        return _MappingPlan(tuple(default_values.items()), pairs)
+
+    def _get_mapping_plan(self, json_data: dict, temp_exclude_keys: Optional[Set[str]] = None,
+                          temp_default_values: Optional[Dict[str, Any]] = None) -> _MappingPlan:
+        """按键集合缓存映射计划; 测试模式传入的临时排除/默认值不进入缓存。"""
+        if temp_exclude_keys or temp_default_values:
+            return self._build_mapping_plan(json_data.keys(), self.exclude_keys.union(temp_exclude_keys or set()),
+                                            temp_default_values or self.default_values)
+        key_set = frozenset(json_data)
+        plan = self._mapping_plans.get(key_set)
+        if plan is None:
+            if len(self._mapping_plans) >= self._MAX_MAPPING_PLANS:
+                self._mapping_plans.clear()
+            plan = self._build_mapping_plan(json_data.keys(), self.exclude_keys, self.default_values)
+            self._mapping_plans[key_set] = plan
+        return plan
+
+    def _call_modifier(self, data_with_defaults: dict) -> dict:
+        if self.modifier_stdout == 'row':
+            with io.StringIO() as buf, redirect_stdout(buf):
+                return self.modifier_function(data_with_defaults)
+        return self.modifier_function(data_with_defaults)
+
     def _process_single_item(self, json_data: dict, temp_exclude_keys: Optional[Set[str]] = None,
                              temp_default_values: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
-        current_excludes = self.exclude_keys.union(temp_exclude_keys or set())
+        return self._finalize_types(self._map_single_item(json_data, temp_exclude_keys, temp_default_values))
+
+    def _map_single_item(self, json_data: dict, temp_exclude_keys: Optional[Set[str]] = None,
+                         temp_default_values: Optional[Dict[str, Any]] = None) -> Dict:
+        """应用映射计划与 modifier_function, 返回尚未做类型收尾的目标字典。"""
+        plan = self._get_mapping_plan(json_data, temp_exclude_keys, temp_default_values)
 
         # 应用 default_values
-        data_with_defaults = {**json_data}
-        for key, default_value in (temp_default_values or self.default_values).items():
-            if data_with_defaults.get(key) in (None, ''):
-                data_with_defaults[key] = default_value
+        if plan.defaults or self.modifier_function:
+            data_with_defaults = {**json_data}
+            for key, default_value in plan.defaults:
+                if data_with_defaults.get(key) in (None, ''):
+                    data_with_defaults[key] = default_value
+        else:
+            data_with_defaults = json_data
 
-        processed_data = {}
         # 应用 include_keys 或 exclude_keys
-        if self.include_keys is not None:
-            for original_key, value in data_with_defaults.items():
-                snake_case_key = self._to_snake_case(original_key)
-                if snake_case_key in self.include_keys:
-                    processed_data[snake_case_key] = value
-        else:
-            for original_key, value in data_with_defaults.items():
-                if original_key not in current_excludes:
-                    processed_data[self._to_snake_case(original_key)] = value
+        processed_data = {target: data_with_defaults[src] for src, target in plan.pairs}
 
         # 应用 modifier_function
         if self.modifier_function:
             try:
-                with io.StringIO() as buf, redirect_stdout(buf):
-                    patch_dict = self.modifier_function(data_with_defaults)
+                patch_dict = self._call_modifier(data_with_defaults)
 
                 # 智能识别被 modifier 显式处理过的键，并更新 processed_data
                 for original_src_key, instruction in patch_dict.items():
-                    target_key_for_patch = None
-                    value_for_patch = None
+                    src_snake_key = self._to_snake_case(original_src_key)
 
                     if isinstance(instruction, Rename):
                         target_key_for_patch = instruction.new_key_name
@@ -209,15 +446,15 @@ class GenericFileProcessor:
                     elif isinstance(instruction, tuple) and len(instruction) == 2:
                         target_key_for_patch, value_for_patch = instruction
                     else:
-                        target_key_for_patch = self._to_snake_case(original_src_key)
+                        target_key_for_patch = src_snake_key
                         value_for_patch = instruction
 
                     if target_key_for_patch is not None and (
                             self.include_keys is None or target_key_for_patch in self.include_keys):
 
                         # 如果原始键被重命名，则移除旧键
-                        if target_key_for_patch != self._to_snake_case(original_src_key) and self._to_snake_case(original_src_key) in processed_data:
-                            del processed_data[self._to_snake_case(original_src_key)]
+                        if target_key_for_patch != src_snake_key and src_snake_key in processed_data:
+                            del processed_data[src_snake_key]
 
                         processed_data[target_key_for_patch] = value_for_patch
 
@@ -225,7 +462,46 @@ class GenericFileProcessor:
                 print(f"[ERROR] modifier_function 执行失败: {e}")
                 raise CallbackException(f"modifier_function error: {e}") from e
 
-        return self._finalize_types(processed_data)
+        return processed_data
+
+    def _transform_rows(self, raw_rows: List[Tuple[Dict, int]]) -> Tuple[List[Tuple[Dict, int]], List[Tuple[int, Exception]]]:
+        """
+        将一批原始记录转换为待写入的数据: 逐行映射与 modifier_function, 然后整批调用
+        batch_modifier_function, 最后做类型收尾。返回 (结果, 错误) 两个按行号排列的列表。
+        """
+        if self.modifier_stdout == 'batch' and (self.modifier_function or self.batch_modifier_function):
+            with io.StringIO() as buf, redirect_stdout(buf):
+                return self._transform_rows_unguarded(raw_rows)
+        return self._transform_rows_unguarded(raw_rows)
+
+    def _transform_rows_unguarded(self, raw_rows: List[Tuple[Dict, int]]) -> Tuple[List[Tuple[Dict, int]], List[Tuple[int, Exception]]]:
+        mapped, errors = [], []
+        for json_data, line_num in raw_rows:
+            try:
+                mapped.append((self._map_single_item(json_data), line_num))
+            except Exception as e:
+                errors.append((line_num, e))
+                if self.on_error == 'stop':
+                    return [], errors
+
+        if self.batch_modifier_function and mapped:
+            try:
+                if self.modifier_stdout == 'row':
+                    with io.StringIO() as buf, redirect_stdout(buf):
+                        modified = self.batch_modifier_function([item for item, _ in mapped])
+                else:
+                    modified = self.batch_modifier_function([item for item, _ in mapped])
+            except Exception as e:
+                errors.append((mapped[-1][1], CallbackException(f"batch_modifier_function error: {e}")))
+                return [], errors
+            if len(modified) == len(mapped):
+                mapped = [(item, line_num) for item, (_, line_num) in zip(modified, mapped)]
+            else:
+                # 批量修改器增删了记录, 无法逐条对应原始行号, 统一使用本批最大行号
+                max_line = mapped[-1][1]
+                mapped = [(item, max_line) for item in modified]
+
+        return self._finalize_batch(mapped, self.compact_json), errors
 
     def _is_skippable_sql_error(self, exception: Exception) -> bool:
         """
@@ -258,56 +534,99 @@ class GenericFileProcessor:
 
         return False
 
-    def _execute_batch(self, data_tuples: List[Tuple[Dict, int]], filename: str):
+    def _current_batch_size(self) -> int:
+        return self.batch_sizer.size if self.batch_sizer else self.batch_size
+
+    def _execute_batch(self, data_tuples: List[Tuple[Dict, int]], filename: str,
+                       callback: Optional[Callable[[bool, List[Dict], str, Optional[int]], None]] = None):
+        """写入一个批次; callback 默认为 self.callBack, 写入流水线会传入自己的回调以便按顺序触发。"""
         if not data_tuples:
             return
+        callback = callback or self.callBack
         json_list = [item[0] for item in data_tuples]
         try:
-            status = self.writer.upsert_batch(json_list, self.table_name, test=self.test)
-            if self.callBack:
-                self.callBack(status, json_list, filename, max(item[1] for item in data_tuples))
+            started = time.perf_counter()
+            # 写入器熔断 (数据库暂时不可用) 时在这里暂停, 读取随之暂停, 恢复后重试本批
+            status = call_when_available(
+                self.writer, lambda: self.writer.upsert_batch(json_list, self.table_name, test=self.test))
+            if self.batch_sizer:
+                self.batch_sizer.record(len(json_list), time.perf_counter() - started, estimate_rows_bytes(json_list))
+            if callback:
+                callback(status, json_list, filename, max(item[1] for item in data_tuples))
             return
         except Exception as batch_exception:
+            if self.batch_sizer and self.batch_sizer.record_error(batch_exception):
+                print(f"\n[INFO] 批量大小已调整为 {self.batch_sizer.size}。")
             print(f"\n[WARNING] 批量写入失败 (文件: {filename})。错误: {batch_exception}")
-            print("--- 即将进入逐行恢复模式 ---")
-            for i, (data_dict, line_num) in enumerate(data_tuples):
-                try:
-                    self.writer.upsert_single(data_dict, self.table_name, test=self.test)
-                    if self.callBack:
-                        self.callBack(True, [data_dict], filename, line_num)
-
-                except Exception as single_exception:
-                    if not self._is_skippable_sql_error(single_exception):
-                        print("\n" + "=" * 80)
-                        print(f"[FATAL] 遇到不可恢复的错误，程序将终止。")
-                        print(f"  - 文件: {filename}\n  - 行号: {line_num}\n  - 错误: {single_exception}")
-                        print("=" * 80)
-                        raise single_exception
-
-                    print("\n" + "=" * 80)
-                    print(
-                        f"[ERROR] 定位到错误行!\n  - 文件: {filename}\n  - 行号: {line_num}\n  - 错误: {single_exception}\n  - 数据: {data_dict}")
-                    print("=" * 80)
-
-                    if self.auto_skip_error:
-                        print(f"  [INFO] 配置了自动跳过，已跳过第 {line_num} 行。")
-                        continue
-                    try:
-                        choice = input("输入 'y' 跳过此行，'s' 跳过本批次剩余所有行，其他任意键将终止程序: ").lower()
-                    except EOFError:
-                        print("\n  [FATAL] 检测到非交互式环境 (EOFError)，无法请求用户输入。将终止当前文件处理。")
-                        raise  # [MODIFIED] Re-raise the EOFError itself to be caught by the outer loop
-
-                    if choice == 'y':
-                        print(f"  [INFO] 已跳过第 {line_num} 行。")
-                        continue
-                    elif choice == 's':
-                        print(f"  [INFO] 已跳过批次中剩余的所有行。")
-                        break
-                    else:
-                        print("  [FATAL] 用户选择终止程序。")
-                        raise single_exception
-            print("--- 逐行恢复模式结束 ---")
+            print("--- 即将进入二分定位恢复模式 ---")
+
+        def write_batch(sub_tuples: List[Tuple[Dict, int]]):
+            call_when_available(self.writer, lambda: self.writer.upsert_batch(
+                [data_dict for data_dict, _ in sub_tuples], self.table_name, test=self.test))
+
+        def write_single(item: Tuple[Dict, int]):
+            call_when_available(self.writer, lambda: self.writer.upsert_single(
+                item[0], self.table_name, test=self.test))
+
+        attempts = bisect_write(data_tuples, write_batch, write_single,
+                                self._recovery_success_handler(filename, callback), self._row_error_handler(filename))
+        print(f"--- 恢复模式结束 (本批 {len(data_tuples)} 行, 共执行 {attempts} 次写入) ---")
+
+    def _recovery_success_handler(self, filename: str, callback: Optional[Callable] = None
+                                  ) -> Callable[[List[Tuple[Dict, int]]], None]:
+        """二分定位恢复中每个写入成功的子批次 (或单行) 的回调, callback 默认为 self.callBack。"""
+        callback = callback or self.callBack
+
+        def on_success(sub_tuples: List[Tuple[Dict, int]]):
+            if callback:
+                callback(True, [data_dict for data_dict, _ in sub_tuples], filename,
+                              max(line_num for _, line_num in sub_tuples))
+
+        return on_success
+
+    def _row_error_handler(self, filename: str) -> Callable[[Tuple[Dict, int], Exception], str]:
+        """二分定位到错误行时的处理: 不可跳过的错误直接终止, 否则按 auto_skip_error 或用户输入决定跳过方式。"""
+        def on_row_error(item: Tuple[Dict, int], single_exception: Exception) -> str:
+            with _PROMPT_LOCK:
+                return self._handle_row_error(filename, item, single_exception, _prompt_stream())
+
+        return on_row_error
+
+    def _handle_row_error(self, filename: str, item: Tuple[Dict, int], single_exception: Exception, stream) -> str:
+        data_dict, line_num = item
+        if not self._is_skippable_sql_error(single_exception):
+            print("\n" + "=" * 80, file=stream)
+            print(f"[FATAL] 遇到不可恢复的错误，程序将终止。", file=stream)
+            print(f"  - 文件: {filename}\n  - 行号: {line_num}\n  - 错误: {single_exception}", file=stream)
+            print("=" * 80, file=stream)
+            raise single_exception
+
+        print("\n" + "=" * 80, file=stream)
+        print(
+            f"[ERROR] 定位到错误行!\n  - 文件: {filename}\n  - 行号: {line_num}\n  - 错误: {single_exception}\n  - 数据: {data_dict}",
+            file=stream)
+        print("=" * 80, file=stream)
+
+        if self.auto_skip_error:
+            print(f"  [INFO] 配置了自动跳过，已跳过第 {line_num} 行。", file=stream)
+            return SKIP
+        # 不使用 input(): 它会把提示写入当前的 sys.stdout, 而主线程可能正把 sys.stdout 重定向到缓冲区
+        print("输入 'y' 跳过此行，'s' 跳过本批次剩余所有行，其他任意键将终止程序: ", end='', file=stream, flush=True)
+        answer = sys.stdin.readline() if sys.stdin else ''
+        if not answer:
+            print("\n  [FATAL] 检测到非交互式环境 (EOFError)，无法请求用户输入。将终止当前文件处理。", file=stream)
+            raise EOFError()
+        choice = answer.strip().lower()
+
+        if choice == 'y':
+            print(f"  [INFO] 已跳过第 {line_num} 行。", file=stream)
+            return SKIP
+        elif choice == 's':
+            print(f"  [INFO] 已跳过批次中剩余的所有行。", file=stream)
+            return SKIP_REST
+        else:
+            print("  [FATAL] 用户选择终止程序。", file=stream)
+            raise single_exception
 
     def _get_display_width(self, text: str) -> int:
         width = 0
@@ -483,11 +802,49 @@ class GenericFileProcessor:
             print("\n--- 'isAllMapping' 校验完成 ---")
             return
 
+        if self._writer_is_async():
+            print(f"[ERROR] {type(self.writer).__name__} 是异步写入器, 请使用 asyncio.run(processor.run_async())。")
+            return
+
         self.test = test
         if test:
             self._run_test_mode()
             return
 
+        self._print_sample_mapping()
+
+        print(f"\n--- 开始处理路径: {self.reader.path} ---")
+        print(f"发现 {len(files_to_process)} 个文件待处理...")
+        pool = self._create_worker_pool()
+        if self.writer_threads:
+            self._write_pipeline = _BatchWriterPipeline(self, self.writer_threads, self.write_queue_size)
+        completed = False
+        try:
+            for i, file_path in enumerate(files_to_process):
+                filename = os.path.basename(file_path)
+                print(f"\n[{i + 1}/{len(files_to_process)}] 正在处理: {filename}")
+                try:
+                    if pool:
+                        self._process_file_parallel(pool, file_path, filename, start_line)
+                    else:
+                        self._process_file(file_path, filename, start_line)
+                    if self._write_pipeline:
+                        self._write_pipeline.drain()
+                    print(f"  [成功] 文件已处理。")
+                except Exception as e:
+                    print(f"\n  [失败] 处理文件 {filename} 时发生致命错误: {e}。")
+                    raise e
+            completed = True
+        finally:
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+            if self._write_pipeline:
+                pipeline, self._write_pipeline = self._write_pipeline, None
+                # 读取/转换过程中已有异常时, 不让写入线程的异常覆盖它
+                pipeline.close(raise_errors=completed)
+        print("\n--- 所有任务处理完成 ---")
+
+    def _print_sample_mapping(self):
         if self.print_mapping_table:
             print("[INFO] 正在抽样以生成字段映射表...")
             samples = self.reader.get_samples(100)
@@ -496,54 +853,327 @@ class GenericFileProcessor:
                 composite_sample.update(sample)
             self._generate_and_print_mapping(composite_sample)
 
-        print(f"\n--- 开始处理路径: {self.reader.path} ---")
+    def _writer_is_async(self) -> bool:
+        return self.writer is not None and inspect.iscoroutinefunction(getattr(self.writer, 'upsert_batch', None))
+
+    async def run_async(self, start_line: int = 1, max_in_flight: Optional[int] = None):
+        """
+        run 的异步版本: 在当前事件循环中逐行读取、按批转换, 同时最多 max_in_flight 个批次在写入。
+        writer 为异步写入器 (如 AsyncMySQLManager) 时直接 await, 否则在线程中调用同步 writer。
+        callBack 仍按批次顺序触发, 因此断点行号的语义与 run 一致。
+        不支持 test / isAllMapping / Eazy Mode 以及多进程解析, 这些场景请使用 run。
+
+        :param max_in_flight: 同时写入的批次数, 默认取 writer.max_in_flight, 没有该属性时为 4。
+        """
+        if not self.is_ready:
+            print("[INFO] 处理器尚未就绪，请根据提示完成配置后再次运行。")
+            return
+        if self.eazy:
+            print("[ERROR] Eazy Mode 不支持 run_async, 请使用 run()。")
+            return
+
+        files_to_process = self.reader.get_files()
+        if not files_to_process:
+            return
+        if max_in_flight is None:
+            max_in_flight = getattr(self.writer, 'max_in_flight', None) or 4
+        if self.workers > 1 or self.writer_threads:
+            print("[WARNING] run_async 在事件循环中完成写入并发, workers 与 writer_threads 参数将被忽略。")
+
+        self.test = False
+        self._print_sample_mapping()
+
+        print(f"\n--- 开始处理路径: {self.reader.path} (异步写入, 并发批次数 {max_in_flight}) ---")
         print(f"发现 {len(files_to_process)} 个文件待处理...")
         for i, file_path in enumerate(files_to_process):
             filename = os.path.basename(file_path)
             print(f"\n[{i + 1}/{len(files_to_process)}] 正在处理: {filename}")
             try:
-                data_tuples: List[Tuple[Dict, int]] = []
-                total_lines = self.reader.get_total_items(file_path)
-
-                line_iterator = self.reader.read_file(file_path, start_line)
-                line_num = None
-                while True:
-                    try:
-                        json_data, line_num = next(line_iterator)
-
-                        if self.filter_function and not self.filter_function(json_data, line_num):
-                            continue
-                        if parsed_dic := self._process_single_item(json_data):
-                            data_tuples.append((parsed_dic, line_num))
-
-                        if total_lines > 0:
-                            bar = '█' * int(40 * line_num / total_lines) + '-' * (40 - int(40 * line_num / total_lines))
-                            sys.stdout.write(
-                                f'\r|{bar}| {line_num / total_lines:.1%} ({line_num}/{total_lines})  本批: [{len(data_tuples)}/{self.batch_size}]')
-                            sys.stdout.flush()
-
-                        if len(data_tuples) >= self.batch_size:
-                            self._execute_batch(data_tuples, filename)
-                            data_tuples = []
-
-                    except StopIteration:
-                        break
-                    except EOFError:
-                        raise
-                    except Exception as parse_e:
-                        error_msg = f"\n[WARNING] 处理文件 {filename} 第 {line_num} 行时发生错误: {parse_e}"
-                        if self.on_error == 'stop':
-                            raise
-                        if self.on_error == 'log_to_file':
-                            with open('error.log', 'a', encoding='utf-8') as err_f:
-                                err_f.write(f"{datetime.now()} | {filename} | Line {line_num} | {parse_e}\n")
-                        print(error_msg)
-
-                print()
-                self._execute_batch(data_tuples, filename)
+                await self._process_file_async(file_path, filename, start_line, max(1, max_in_flight))
                 print(f"  [成功] 文件已处理。")
             except Exception as e:
                 print(f"\n  [失败] 处理文件 {filename} 时发生致命错误: {e}。")
                 raise e
         print("\n--- 所有任务处理完成 ---")
 
+    async def _process_file_async(self, file_path: str, filename: str, start_line: int, max_in_flight: int):
+        """_process_file 的异步版本, 写入任务按提交顺序依次收尾。"""
+        raw_rows: List[Tuple[Dict, int]] = []
+        in_flight: deque = deque()
+        progress = ProgressReporter(self.reader.get_total_items(file_path))
+
+        line_iterator = self.reader.read_file(file_path, start_line)
+        line_num = None
+        try:
+            while True:
+                try:
+                    json_data, line_num = next(line_iterator)
+
+                    if self.filter_function and not self.filter_function(json_data, line_num):
+                        continue
+                    raw_rows.append((json_data, line_num))
+
+                    batch_size = self._current_batch_size()
+                    progress.update(line_num, f"本批: [{len(raw_rows)}/{batch_size}]")
+
+                    if len(raw_rows) >= batch_size:
+                        await self._flush_rows_async(raw_rows, filename, in_flight, max_in_flight)
+                        raw_rows = []
+
+                except StopIteration:
+                    break
+                except EOFError:
+                    raise
+                except Exception as parse_e:
+                    self._handle_line_error(filename, line_num, parse_e)
+
+            progress.close(f"本批: [{len(raw_rows)}/{self._current_batch_size()}]")
+            await self._flush_rows_async(raw_rows, filename, in_flight, max_in_flight)
+            while in_flight:
+                await self._finish_async_batch(*in_flight.popleft())
+        finally:
+            # 出错退出时等待已经发出的写入结束, 不留下悬空的任务
+            if in_flight:
+                await asyncio.gather(*(task for task, _, _ in in_flight), return_exceptions=True)
+
+    async def _flush_rows_async(self, raw_rows: List[Tuple[Dict, int]], filename: str, in_flight: deque,
+                                max_in_flight: int):
+        items, errors = self._transform_rows(raw_rows)
+        for line_num, transform_e in errors:
+            self._handle_line_error(filename, line_num, transform_e)
+        if not items:
+            return
+        while len(in_flight) >= max_in_flight:
+            await self._finish_async_batch(*in_flight.popleft())
+        task = asyncio.ensure_future(self._timed_write_async([data_dict for data_dict, _ in items]))
+        in_flight.append((task, items, filename))
+        # 让出事件循环, 使新任务立即把语句发送出去
+        await asyncio.sleep(0)
+
+    async def _call_writer_async(self, method_name: str, data: Any) -> Any:
+        method = getattr(self.writer, method_name)
+        if inspect.iscoroutinefunction(method):
+            return await method(data, self.table_name, test=self.test)
+        return await asyncio.to_thread(
+            call_when_available, self.writer, lambda: method(data, self.table_name, test=self.test))
+
+    async def _timed_write_async(self, json_list: List[Dict]) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        status = await self._call_writer_async('upsert_batch', json_list)
+        return status, time.perf_counter() - started
+
+    async def _finish_async_batch(self, task: 'asyncio.Future', data_tuples: List[Tuple[Dict, int]], filename: str):
+        """等待一个写入任务结束: 成功时触发 callBack, 失败时进入二分定位恢复模式。"""
+        json_list = [item[0] for item in data_tuples]
+        try:
+            status, elapsed = await task
+        except Exception as batch_exception:
+            if self.batch_sizer and self.batch_sizer.record_error(batch_exception):
+                print(f"\n[INFO] 批量大小已调整为 {self.batch_sizer.size}。")
+            print(f"\n[WARNING] 批量写入失败 (文件: {filename})。错误: {batch_exception}")
+            print("--- 即将进入二分定位恢复模式 ---")
+        else:
+            if self.batch_sizer:
+                self.batch_sizer.record(len(json_list), elapsed, estimate_rows_bytes(json_list))
+            if self.callBack:
+                self.callBack(status, json_list, filename, max(item[1] for item in data_tuples))
+            return
+
+        async def write_batch(sub_tuples: List[Tuple[Dict, int]]):
+            await self._call_writer_async('upsert_batch', [data_dict for data_dict, _ in sub_tuples])
+
+        async def write_single(item: Tuple[Dict, int]):
+            await self._call_writer_async('upsert_single', item[0])
+
+        attempts = await bisect_write_async(data_tuples, write_batch, write_single,
+                                            self._recovery_success_handler(filename), self._row_error_handler(filename))
+        print(f"--- 恢复模式结束 (本批 {len(data_tuples)} 行, 共执行 {attempts} 次写入) ---")
+
+    def _dispatch_batch(self, data_tuples: List[Tuple[Dict, int]], filename: str):
+        """启用写入流水线时将批次交给后台写入线程, 否则同步写入。"""
+        if not data_tuples:
+            return
+        if self._write_pipeline:
+            self._write_pipeline.submit(data_tuples, filename)
+        else:
+            self._execute_batch(data_tuples, filename)
+
+    def _handle_line_error(self, filename: str, line_num: Optional[int], parse_e: Exception):
+        """按照 on_error 策略处理单行解析/转换错误, 'stop' 模式下直接抛出。"""
+        error_msg = f"\n[WARNING] 处理文件 {filename} 第 {line_num} 行时发生错误: {parse_e}"
+        if self.on_error == 'stop':
+            raise parse_e
+        if self.on_error == 'log_to_file':
+            with open('error.log', 'a', encoding='utf-8') as err_f:
+                err_f.write(f"{datetime.now()} | {filename} | Line {line_num} | {parse_e}\n")
+        print(error_msg)
+
+    def _process_file(self, file_path: str, filename: str, start_line: int):
+        """单进程逐行读取、解析, 每凑满一批后统一转换并写入一个文件。"""
+        raw_rows: List[Tuple[Dict, int]] = []
+        progress = ProgressReporter(self.reader.get_total_items(file_path))
+
+        line_iterator = self.reader.read_file(file_path, start_line)
+        line_num = None
+        while True:
+            try:
+                json_data, line_num = next(line_iterator)
+
+                if self.filter_function and not self.filter_function(json_data, line_num):
+                    continue
+                raw_rows.append((json_data, line_num))
+
+                batch_size = self._current_batch_size()
+                progress.update(line_num, f"本批: [{len(raw_rows)}/{batch_size}]")
+
+                if len(raw_rows) >= batch_size:
+                    self._flush_rows(raw_rows, filename)
+                    raw_rows = []
+
+            except StopIteration:
+                break
+            except EOFError:
+                raise
+            except Exception as parse_e:
+                self._handle_line_error(filename, line_num, parse_e)
+
+        progress.close(f"本批: [{len(raw_rows)}/{self._current_batch_size()}]")
+        self._flush_rows(raw_rows, filename)
+
+    def _flush_rows(self, raw_rows: List[Tuple[Dict, int]], filename: str):
+        items, errors = self._transform_rows(raw_rows)
+        for line_num, transform_e in errors:
+            self._handle_line_error(filename, line_num, transform_e)
+        self._dispatch_batch(items, filename)
+
+    def _create_worker_pool(self) -> Optional[ProcessPoolExecutor]:
+        """workers > 1 且 reader 支持按字节区间读取时, 创建用于解析/转换的进程池。"""
+        if self.workers <= 1:
+            return None
+        if not (hasattr(self.reader, 'get_line_ranges') and hasattr(self.reader, 'read_range')):
+            print(f"[WARNING] {type(self.reader).__name__} 不支持按字节区间读取, workers 参数将被忽略, 使用单进程处理。")
+            return None
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_parse_worker,
+                                   initargs=(self._parse_worker_state(),))
+
+    def _parse_worker_state(self) -> Dict[str, Any]:
+        """
+        收集子进程解析/转换所需的属性 (writer、callBack 等只在主进程中使用, 不会传给子进程)。
+        非 fork 启动方式下这些属性需要被 pickle 传给子进程, 因此先逐个检查, 出错时直接指明是哪个参数。
+        """
+        state = {name: getattr(self, name) for name in _PARSE_WORKER_ATTRIBUTES}
+        if multiprocessing.get_start_method() != 'fork':
+            for name, value in state.items():
+                try:
+                    pickle.dumps(value)
+                except Exception as e:
+                    raise TypeError(f"workers > 1 时 {name} 必须可以被 pickle 序列化以传给子进程 "
+                                    f"(请使用模块级函数, 而不是 lambda 或嵌套函数): {e}") from e
+        return state
+
+    def _transform_range(self, file_path: str, start: int, end: int, first_line: int,
+                         start_line: int) -> Tuple[List[Tuple[Dict, int]], List[Tuple[int, Exception]]]:
+        """
+        在子进程中解析并转换一个字节区间, 转换按 batch_size 分片进行。
+        'stop' 模式下遇到第一个错误即停止, 其余模式收集所有错误交由主进程按顺序处理。
+        """
+        items, errors, raw_rows = [], [], []
+
+        def flush():
+            batch_items, batch_errors = self._transform_rows(raw_rows)
+            items.extend(batch_items)
+            errors.extend((line_num, _portable_exception(e)) for line_num, e in batch_errors)
+            raw_rows.clear()
+
+        for line, line_num in self.reader.read_range(file_path, start, end, first_line):
+            if line_num < start_line or not line.strip():
+                continue
+            try:
+                json_data = self.reader._safe_json_load(line, file_path)
+                if not json_data:
+                    raise ValueError("JSON 解析失败或为空")
+                if self.filter_function and not self.filter_function(json_data, line_num):
+                    continue
+                raw_rows.append((json_data, line_num))
+            except Exception as e:
+                errors.append((line_num, _portable_exception(e)))
+                if self.on_error == 'stop':
+                    break
+            if len(raw_rows) >= self.batch_size:
+                flush()
+                if errors and self.on_error == 'stop':
+                    break
+        if raw_rows and not (errors and self.on_error == 'stop'):
+            flush()
+        errors.sort(key=lambda error: error[0])
+        return items, errors
+
+    def _process_file_parallel(self, pool: ProcessPoolExecutor, file_path: str, filename: str, start_line: int):
+        """
+        多进程模式: 文件被切分为按行对齐的字节区间, 由进程池并行解析和转换,
+        主进程按区间顺序取回结果, 因此写入顺序、行号以及 callBack 的语义与单进程模式一致。
+        """
+        ranges = self.reader.get_line_ranges(file_path, self.chunk_bytes, start_line)
+        progress = ProgressReporter(ranges[-1][2] + ranges[-1][3] - 1 if ranges else 0)
+        pending_ranges = iter([r for r in ranges if r[2] + r[3] > start_line])
+
+        def submit_next() -> bool:
+            next_range = next(pending_ranges, None)
+            if next_range is None:
+                return False
+            start, end, first_line, _ = next_range
+            futures.append(pool.submit(_transform_range_in_worker, file_path, start, end, first_line, start_line))
+            return True
+
+        # 限制在途区间数量, 避免结果在主进程中无限堆积
+        futures = deque()
+        for _ in range(self.workers * 2):
+            if not submit_next():
+                break
+
+        data_tuples: List[Tuple[Dict, int]] = []
+        while futures:
+            items, errors = futures.popleft().result()
+            submit_next()
+            for parsed_dic, line_num in items:
+                data_tuples.append((parsed_dic, line_num))
+                if len(data_tuples) >= self._current_batch_size():
+                    self._dispatch_batch(data_tuples, filename)
+                    data_tuples = []
+            for line_num, parse_e in errors:
+                self._handle_line_error(filename, line_num, parse_e)
+            if items:
+                progress.update(items[-1][1], f"本批: [{len(data_tuples)}/{self._current_batch_size()}]")
+
+        progress.close(f"本批: [{len(data_tuples)}/{self._current_batch_size()}]")
+        self._dispatch_batch(data_tuples, filename)
+
+
+# 子进程解析/转换时用到的处理器属性
+_PARSE_WORKER_ATTRIBUTES = ('reader', 'modifier_function', 'filter_function', 'batch_modifier_function',
+                            'exclude_keys', 'include_keys', 'default_values', 'batch_size', 'on_error',
+                            'modifier_stdout', 'compact_json')
+
+_WORKER_PROCESSOR: Optional[GenericFileProcessor] = None
+
+
+def _init_parse_worker(state: Dict[str, Any]):
+    """进程池初始化函数: 在子进程中用 _parse_worker_state 收集的属性构建一个只用于解析/转换的处理器。"""
+    global _WORKER_PROCESSOR
+    processor = GenericFileProcessor.__new__(GenericFileProcessor)
+    processor.__dict__.update(state)
+    processor._mapping_plans = {}
+    _WORKER_PROCESSOR = processor
+
+
+def _transform_range_in_worker(file_path: str, start: int, end: int, first_line: int, start_line: int):
+    return _WORKER_PROCESSOR._transform_range(file_path, start, end, first_line, start_line)
+
+
+def _portable_exception(e: Exception) -> Exception:
+    """确保异常可以跨进程传递, 无法序列化时退化为携带原始信息的 RuntimeError。"""
+    try:
+        pickle.dumps(e)
+        return e
+    except Exception:
+        return RuntimeError(f"{type(e).__name__}: {e}")
@@ -5,12 +5,12 @@ import asyncio
 import aiofiles
 from tqdm import tqdm
 from typing import Dict, Any, Union, List
-import ast
 
 from mignonFramework.utils.config.ConfigReader import ConfigManager
 from mignonFramework.utils.BaseStateTracker import BaseStateTracker
 from mignonFramework.utils.SQLiteStateTracker import SQLiteStateTracker
 from mignonFramework.utils.MoveStateTracker import MoveStateTracker
+from mignonFramework.utils.reader.LineDecoder import LineDecoder
 
 def _guide_user_for_config(config_manager: ConfigManager):
     """
@@ -102,15 +102,13 @@ def run(config_path: str = './resources/config/processFile.ini'):
 
 # --- 内部核心异步逻辑 ---
 
+# 同一批源文件通常格式一致, 共用一个解码器保留格式判断结果
+_default_decoder = LineDecoder()
+
+
 def _default_parse_func(content: str) -> Union[Dict[str, Any], List[Any]]:
     """默认解析器"""
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        try:
-            return ast.literal_eval(content)
-        except Exception as e:
-            raise ValueError(f"Failed to parse with both json and ast. AST Error: {e}") from e
+    return _default_decoder.decode(content)
 
 def _get_line_count(file_path: str) -> int:
     if not os.path.exists(file_path):
@@ -2,24 +2,33 @@ import sqlite3
 import os
 import shutil
 import asyncio
-from typing import List, Optional
+from typing import List, Optional, Union
 import queue
 import threading
 import time
 
 # 假设 BaseStateTracker 在这个路径
 from mignonFramework.utils.BaseStateTracker import BaseStateTracker
+from mignonFramework.utils.utilClass.AdaptiveBatchSizer import AdaptiveBatchSizer
 
 class SQLiteStateTracker(BaseStateTracker):
     """
     使用SQLite数据库来跟踪文件处理状态的具体实现。
     内部使用一个专用的写入线程，并通过批量写入和PRAGMA调优来获得高性能。
     """
-    def __init__(self, db_path: str, table_name: str = 'file_status', exception_dir: Optional[str] = None, batch_size: int = 1000):
+    def __init__(self, db_path: str, table_name: str = 'file_status', exception_dir: Optional[str] = None, batch_size: int = 1000,
+                 adaptive_batch: Union[bool, AdaptiveBatchSizer] = False):
         self.db_path = db_path
         self.table_name = table_name
         self.exception_dir = exception_dir
         self.batch_size = batch_size # 批处理大小
+        # 自适应批量: 根据 executemany 的实测耗时调整批处理大小
+        if isinstance(adaptive_batch, AdaptiveBatchSizer):
+            self.batch_sizer: Optional[AdaptiveBatchSizer] = adaptive_batch
+        elif adaptive_batch:
+            self.batch_sizer = AdaptiveBatchSizer(initial=batch_size, target_latency=0.05)
+        else:
+            self.batch_sizer = None
 
         self.db_queue = queue.Queue()
         self.writer_thread = None
@@ -68,7 +77,7 @@ class SQLiteStateTracker(BaseStateTracker):
                 batch.append(item)
 
                 # 当批次达到规模时，执行写入
-                if len(batch) >= self.batch_size:
+                if len(batch) >= (self.batch_sizer.size if self.batch_sizer else self.batch_size):
                     self._execute_batch(conn, batch)
                     batch = [] # 清空批次
 
@@ -91,9 +100,14 @@ class SQLiteStateTracker(BaseStateTracker):
                 error_message=excluded.error_message,
                 timestamp=CURRENT_TIMESTAMP;
             """
+            started = time.perf_counter()
             conn.executemany(sql, batch)
             conn.commit()
+            if self.batch_sizer:
+                self.batch_sizer.record(len(batch), time.perf_counter() - started)
         except Exception as e:
+            if self.batch_sizer:
+                self.batch_sizer.record_error(e)
             print(f"[数据库批量写入错误] {e}")
 
 
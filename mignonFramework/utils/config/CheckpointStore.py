@@ -0,0 +1,120 @@
+"""
+断点存储 CheckpointStore(db_path, flush_every, flush_interval)
+基于 SQLite (WAL 模式) 的键值存储, 用于保存频繁更新的断点 (如各表已写入的最大 id);
+set() 只写入内存缓冲区, 每累计 flush_every 次更新或距上次落盘超过 flush_interval 秒时, 在一个事务内整体写入。
+进程意外退出时最多丢失最近一次落盘之后的更新, 断点只会回退不会超前, 由调用方按幂等写入 (upsert) 重放。
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict
+
+_DELETED = object()
+
+
+class CheckpointStore:
+    """一个线程安全的断点存储, 值以 JSON 形式保存。"""
+
+    def __init__(self, db_path: str, flush_every: int = 100, flush_interval: float = 5.0,
+                 table_name: str = 'checkpoints'):
+        """
+        :param db_path: SQLite 数据库文件路径, 目录不存在时自动创建。
+        :param flush_every: 累计多少次 set/delete 后落盘, 1 表示每次都落盘。
+        :param flush_interval: 距上次落盘超过该秒数时, 下一次 set/delete 会触发落盘。
+        :param table_name: 存放断点的表名。
+        """
+        self.db_path = db_path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.table_name = table_name
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Any] = {}
+        self._updates = 0
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL 模式下 synchronous = NORMAL 可保证进程崩溃时已提交的事务不丢失
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        with self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS "{self.table_name}" (
+                    key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL
+                )""")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取一个断点, 未落盘的更新优先。"""
+        with self._lock:
+            if key in self._pending:
+                value = self._pending[key]
+                return default if value is _DELETED else value
+            row = self._conn.execute(f'SELECT value FROM "{self.table_name}" WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def items(self, prefix: str = '') -> Dict[str, Any]:
+        """读取所有以 prefix 开头的断点 (包括未落盘的更新)。"""
+        with self._lock:
+            rows = self._conn.execute(f'SELECT key, value FROM "{self.table_name}" WHERE substr(key, 1, ?) = ?',
+                                      (len(prefix), prefix)).fetchall()
+            result = {key: json.loads(value) for key, value in rows}
+            for key, value in self._pending.items():
+                if not key.startswith(prefix):
+                    continue
+                if value is _DELETED:
+                    result.pop(key, None)
+                else:
+                    result[key] = value
+        return result
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._pending[key] = value
+            self._after_update()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pending[key] = _DELETED
+            self._after_update()
+
+    def _after_update(self):
+        self._updates += 1
+        if self._updates >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的更新在一个事务内写入数据库。"""
+        with self._lock:
+            if self._pending:
+                now = time.time()
+                with self._conn:
+                    for key, value in self._pending.items():
+                        if value is _DELETED:
+                            self._conn.execute(f'DELETE FROM "{self.table_name}" WHERE key = ?', (key,))
+                        else:
+                            self._conn.execute(
+                                f'INSERT OR REPLACE INTO "{self.table_name}" (key, value, updated_at) VALUES (?, ?, ?)',
+                                (key, json.dumps(value, ensure_ascii=False), now))
+                self._pending.clear()
+            self._updates = 0
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        """落盘剩余的更新并关闭数据库连接。"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<CheckpointStore {self.db_path}>"
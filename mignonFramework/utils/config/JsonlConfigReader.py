@@ -398,8 +398,11 @@ class JsonConfigManager:
             try:
                 dir_name = os.path.dirname(self.filename)
                 if dir_name: os.makedirs(dir_name, exist_ok=True)
-                with open(self.filename, 'w', encoding='utf-8') as f:
+                # 先写入同目录下的临时文件再替换, 保存过程中中断不会留下不完整的配置文件
+                temp_filename = f"{self.filename}.tmp"
+                with open(temp_filename, 'w', encoding='utf-8') as f:
                     json.dump(self.data, f, ensure_ascii=False, indent=4, default=self.default_json_encoder)
+                os.replace(temp_filename, self.filename)
             except IOError as e:
                 sys.stderr.write(f"FATAL: 保存 {self.filename} 失败. Error: {e}\n")
 
@@ -69,8 +69,12 @@ This module focuses on migration, not on intervening in transfers. It only handl
 import sys
 import os
 import json
+import time
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type, Dict
+from typing import List, Optional, Type, Dict, NamedTuple, Tuple, Iterable, Iterator, Callable, Any
 from datetime import date, datetime
 from collections import defaultdict
 
@@ -78,6 +82,11 @@ from collections import defaultdict
 try:
     from mignonFramework.utils.config.JsonlConfigReader import JsonConfigManager
     from mignonFramework.utils.writer.MySQLManager import MysqlManager
+    from mignonFramework.utils.utilClass.ProgressReporter import ProgressReporter
+    from mignonFramework.utils.writer.ErrorIsolation import SKIP, SKIP_REST, bisect_write
+    from mignonFramework.utils.writer.CircuitBreaker import call_when_available
+    from mignonFramework.utils.utilClass.AdaptiveBatchSizer import AdaptiveBatchSizer, estimate_rows_bytes
+    from mignonFramework.utils.config.CheckpointStore import CheckpointStore
 except ImportError:
     sys.exit(1)
 
@@ -88,6 +97,17 @@ except ImportError:
     Flask = None
 
 
+def _default_checkpoint_path(config_path: str) -> str:
+    """断点存储 (SQLite) 的默认路径: 与配置文件同目录, 扩展名为 .checkpoints.db。"""
+    return os.path.splitext(config_path)[0] + '.checkpoints.db'
+
+
+def _config_file_path(config) -> Optional[str]:
+    """JsonConfigManager 配置代理对应的配置文件路径; 普通的 TransferConfig 对象没有配置文件, 返回 None。"""
+    manager = getattr(getattr(config, '_save_callback', None), '__self__', None)
+    return getattr(manager, 'filename', None)
+
+
 # --- 1. 配置模型定义 ---
 # 定义与 JSON 结构严格对应的配置类
 class TransferConfig:
@@ -109,6 +129,35 @@ class TransferConfig:
     includeList: List[str]
     batchSize: int = 1000  # 默认的批量大小
     autoSkipError: bool = False # 新增：是否自动跳过错误行
+    bulkInsert: bool = False  # 是否使用多行 VALUES 语句批量写入目标库
+    adaptiveBatch: bool = False  # 是否根据实测写入耗时自动调整批量大小 (以 batchSize 为初始值)
+    targetLatencyMs: int = 200  # 自适应模式下单批写入的目标耗时 (毫秒)
+    minBatchSize: int = 100
+    maxBatchSize: int = 20000
+    streamRead: bool = False  # 是否使用服务端游标流式读取源表, 以元组直接写入目标库
+    streamPageSize: int = 100000  # 流式读取时每条分页查询的行数, 页内按 batchSize 分批读取与写入
+    parallelTables: int = 1  # 同时迁移的表数量, 表只会在其外键父表全部完成后开始
+    tableCheckpoints: Dict[str, int] = {}  # 各表的断点 (表名 -> 已写入的最大 id), 只整体替换, 不原地修改
+    rangeSplits: int = 1  # 单表内并行读写的 id 区间 (worker) 数量, 大于 1 时按 [min_id, max_id] 拆分
+    pipelineDepth: int = 0  # 大于 0 时开启读写流水线: 后台线程最多预读 pipelineDepth 批数据, 与写入同时进行
+    rangeCheckpoints: Dict[str, List[List[int]]] = {}  # 区间拆分时各表未完成区间的断点 (表名 -> [[last_id, end_id], ...])
+    checkpointFlushBatches: int = 100  # DatabaseTransferRunner 的断点存储每累计多少次更新落盘一次
+    checkpointFlushSeconds: float = 5.0  # 断点存储距上次落盘超过该秒数时落盘
+    incrementalColumn: str = "updated_at"  # 增量同步使用的更新时间列
+    incrementalInterval: float = 10.0  # 增量同步每轮之间的间隔 (秒)
+    incrementalLagSeconds: int = 5  # 只同步更新时间早于 (源库当前时间 - 该秒数) 的行, 给进行中的事务留出提交时间
+    incrementalStartAt: str = ""  # 没有水位线的表 (全量迁移时未记录水位线) 从该时间开始同步, 为空时从头同步
+    tableWatermarks: Dict[str, List] = {}  # 未使用断点存储时各表的增量水位线 (表名 -> [更新时间, id]), 全量迁移开始时自动记录
+
+
+class _NullStream:
+    """并行迁移时单表进度条的输出目标, 进度由调度器汇总显示。"""
+
+    def write(self, text: str):
+        pass
+
+    def flush(self):
+        pass
 
 # --- 2. 抽象的数据库迁移基类 ---
 class AbstractDatabaseTransfer(ABC):
@@ -117,14 +166,208 @@ class AbstractDatabaseTransfer(ABC):
     所有具体的迁移实现（如MySQL->MySQL, PG->MySQL等）都应继承此类。
     这确保了“可插拔”的特性。
     """
-    def __init__(self, config: TransferConfig):
+    # 并行迁移时, 没有表开始或结束的情况下两次状态输出之间的最小间隔 (秒)
+    _PARALLEL_STATUS_INTERVAL = 30.0
+
+    def __init__(self, config: TransferConfig, checkpoint_store: Optional[CheckpointStore] = None):
+        """
+        :param config: 迁移配置 (通常为 JsonConfigManager 的配置代理)。
+        :param checkpoint_store: 可选, 保存各表断点的 CheckpointStore; 为 None 且配置来自 JsonConfigManager 时,
+                                 首次保存断点前在配置文件旁自动创建, 不会每批重写整个配置文件。
+        """
         self.config = config
+        self._checkpoint_store = checkpoint_store
+        self._checkpoint_store_resolved = checkpoint_store is not None
+        self._owns_checkpoint_store = False
         self.source_db = None
         self.target_db = None
         # 初始化一个缓存，用于存储已查询过的表的生成列信息
         self._generated_columns_cache = {}
+        self._column_plan_cache = {}
+        self._incremental_skipped = set()
+        # 断点与配置文件的写入锁, 并行迁移多张表时保证每次保存的内容完整
+        self._checkpoint_lock = threading.RLock()
+        self._parallel_progress: Optional[Dict[str, ProgressReporter]] = None
+        self.batch_sizer = None
+        if getattr(config, 'adaptiveBatch', False):
+            self.batch_sizer = AdaptiveBatchSizer(
+                initial=int(config.batchSize),
+                min_size=int(config.minBatchSize),
+                max_size=int(config.maxBatchSize),
+                target_latency=int(config.targetLatencyMs) / 1000,
+                stats_callback=self.on_batch_stats
+            )
         print(f"正在初始化迁移配置, 源数据库: {config.needToTransferredDataBase}")
 
+    @property
+    def checkpoint_store(self) -> Optional[CheckpointStore]:
+        """
+        保存断点的 CheckpointStore。构造时未传入时在首次使用时按需创建 (与 DatabaseTransferRunner 使用同一个文件),
+        迁移结束时由迁移类自己关闭; 配置为普通的 TransferConfig 对象 (没有配置文件) 时为 None, 断点直接保存在配置对象上。
+        """
+        if not getattr(self, '_checkpoint_store_resolved', False):
+            with self._checkpoint_lock:
+                if not self._checkpoint_store_resolved:
+                    config_path = _config_file_path(self.config)
+                    if config_path:
+                        self._checkpoint_store = CheckpointStore(
+                            _default_checkpoint_path(config_path),
+                            flush_every=int(self.config.checkpointFlushBatches or 100),
+                            flush_interval=float(self.config.checkpointFlushSeconds or 5.0))
+                        self._owns_checkpoint_store = True
+                    self._checkpoint_store_resolved = True
+        return getattr(self, '_checkpoint_store', None)
+
+    @checkpoint_store.setter
+    def checkpoint_store(self, store: Optional[CheckpointStore]):
+        self._checkpoint_store = store
+        self._checkpoint_store_resolved = True
+        self._owns_checkpoint_store = False
+
+    def _release_checkpoint_store(self):
+        """运行结束时落盘断点; 自动创建的断点存储同时关闭, 再次运行时重新创建。"""
+        store = getattr(self, '_checkpoint_store', None)
+        if store is None:
+            return
+        if self._owns_checkpoint_store:
+            store.close()
+            self._checkpoint_store = None
+            self._checkpoint_store_resolved = False
+            self._owns_checkpoint_store = False
+        else:
+            store.flush()
+
+    def on_batch_stats(self, stats: Dict):
+        """
+        自适应批量模式下每写入一批后调用, stats 包含 batch_size、latency、reason 等字段。
+        默认不做任何事情, 子类可重写以记录或上报。
+        """
+        pass
+
+    def _current_batch_size(self) -> int:
+        return self.batch_sizer.size if self.batch_sizer else self.config.batchSize
+
+    def _checkpoint_map(self) -> Dict[str, int]:
+        checkpoints = self.config.tableCheckpoints
+        if not checkpoints:
+            return {}
+        return dict(getattr(checkpoints, '_data', checkpoints))
+
+    def _checkpoint_summary(self) -> Dict[str, int]:
+        """当前所有进行中表的断点, 用于出错时的提示。"""
+        checkpoints = self._checkpoint_map()
+        if self.checkpoint_store is not None:
+            checkpoints.update({key[len('table:'):]: value
+                                for key, value in self.checkpoint_store.items('table:').items()})
+        return checkpoints
+
+    def _get_checkpoint(self, table_name: str) -> int:
+        """
+        读取表的断点 (已写入的最大 id)。使用 CheckpointStore 时优先读取其中的记录,
+        没有记录时以配置文件中的 tableCheckpoints 以及旧配置的 nowTitle / nowLastId 为准。
+        """
+        with self._checkpoint_lock:
+            if self.checkpoint_store is not None:
+                stored = self.checkpoint_store.get(f'table:{table_name}')
+                if stored is not None:
+                    return int(stored)
+            checkpoints = self._checkpoint_map()
+            if table_name in checkpoints:
+                return int(checkpoints[table_name] or 0)
+            if self.config.nowTitle == table_name:
+                return int(self.config.nowLastId or 0)
+            return 0
+
+    def _save_checkpoint(self, table_name: str, last_id: int):
+        """
+        保存表的断点。使用 CheckpointStore 时按其落盘策略批量写入;
+        否则在锁内整体替换配置文件中的断点表, 多个表同时迁移时互不覆盖。
+        """
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.set(f'table:{table_name}', last_id)
+            return
+        with self._checkpoint_lock:
+            checkpoints = self._checkpoint_map()
+            checkpoints[table_name] = last_id
+            self.config.tableCheckpoints = checkpoints
+
+    def _range_checkpoint_map(self) -> Dict[str, List[List[int]]]:
+        checkpoints = self.config.rangeCheckpoints
+        if not checkpoints:
+            return {}
+        return {table: [list(getattr(item, '_data', item)) for item in getattr(ranges, '_data', ranges)]
+                for table, ranges in getattr(checkpoints, '_data', checkpoints).items()}
+
+    def _get_range_checkpoints(self, table_name: str) -> List[List[int]]:
+        """读取表的区间断点: 未完成区间的 [已写入的最大 id, 区间结束 id] 列表。"""
+        with self._checkpoint_lock:
+            if self.checkpoint_store is not None:
+                stored = self.checkpoint_store.get(f'ranges:{table_name}')
+                if stored is not None:
+                    return [[int(last), int(end)] for last, end in stored]
+            return [[int(last), int(end)] for last, end in self._range_checkpoint_map().get(table_name, [])]
+
+    def _save_range_checkpoints(self, table_name: str, ranges: List[List[int]]):
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.set(f'ranges:{table_name}', ranges)
+            return
+        with self._checkpoint_lock:
+            checkpoints = self._range_checkpoint_map()
+            checkpoints[table_name] = ranges
+            self.config.rangeCheckpoints = checkpoints
+
+    def _mark_table_finished(self, table_name: str):
+        with self._checkpoint_lock:
+            self.config.alreadyFinished.append(table_name)
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.delete(f'table:{table_name}')
+                self.checkpoint_store.delete(f'ranges:{table_name}')
+                self.checkpoint_store.flush()
+            checkpoints = self._checkpoint_map()
+            if table_name in checkpoints:
+                del checkpoints[table_name]
+                self.config.tableCheckpoints = checkpoints
+            range_checkpoints = self._range_checkpoint_map()
+            if table_name in range_checkpoints:
+                del range_checkpoints[table_name]
+                self.config.rangeCheckpoints = range_checkpoints
+            if self.config.nowTitle == table_name or self._parallel_progress is None:
+                self.config.nowTitle = ""
+                self.config.nowLastId = 0
+
+    def _get_watermark(self, table_name: str) -> Optional[Tuple[str, int]]:
+        """读取表的增量水位线 (更新时间, id), 与断点保存在同一位置; 没有时返回 None。"""
+        with self._checkpoint_lock:
+            watermark = None
+            if self.checkpoint_store is not None:
+                watermark = self.checkpoint_store.get(f'watermark:{table_name}')
+            if watermark is None:
+                watermarks = self.config.tableWatermarks
+                watermarks = getattr(watermarks, '_data', watermarks) or {}
+                watermark = watermarks.get(table_name)
+            if not watermark:
+                return None
+            value, last_id = getattr(watermark, '_data', watermark)
+            return str(value), int(last_id)
+
+    def _save_watermark(self, table_name: str, watermark: Tuple[str, int]):
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.set(f'watermark:{table_name}', list(watermark))
+            return
+        with self._checkpoint_lock:
+            watermarks = self.config.tableWatermarks
+            watermarks = dict(getattr(watermarks, '_data', watermarks) or {})
+            watermarks[table_name] = list(watermark)
+            self.config.tableWatermarks = watermarks
+
+    def _create_progress(self, table_name: str, total: int) -> ProgressReporter:
+        """单表进度条; 并行迁移时不直接输出, 由调度器汇总显示。"""
+        if self._parallel_progress is None:
+            return ProgressReporter(total)
+        reporter = ProgressReporter(total, stream=_NullStream())
+        self._parallel_progress[table_name] = reporter
+        return reporter
+
     @abstractmethod
     def connect_dbs(self):
         """建立到源和目标数据库的连接。"""
@@ -145,6 +388,10 @@ class AbstractDatabaseTransfer(ABC):
         """获取源数据库中指定表的最大ID。"""
         pass
 
+    def get_min_id(self, table_name: str) -> int:
+        """获取源数据库中指定表的最小ID, 用于拆分 id 区间; 默认返回 1, 子类可按需覆盖。"""
+        return 1
+
     @abstractmethod
     def get_table_ddl(self, table_name: str) -> str:
         """获取指定表的 CREATE TABLE DDL 语句。"""
@@ -164,11 +411,63 @@ class AbstractDatabaseTransfer(ABC):
         """在目标数据库中执行 DDL 创建表。"""
         pass
 
+    def _handle_row_error(self, table_name: str, row_data: dict, single_exception: Exception) -> str:
+        """二分定位到错误行后的处理: 自动跳过, 或由用户选择跳过此行 / 跳过本批次剩余行 / 终止。"""
+        row_id = row_data.get('id', 'N/A')
+        print("\n" + "=" * 80)
+        print(f"[错误] 定位到错误行!\n  - 表名: {table_name}\n  - ID: {row_id}\n  - 错误: {single_exception}\n  - 数据: {row_data}")
+        print("=" * 80)
+
+        if self.config.autoSkipError:
+            print(f"  [信息] 配置了自动跳过，已跳过此行。")
+            return SKIP
+
+        choice = input("输入 'y' 跳过此行，'s' 跳过本批次剩余所有行，其他任意键将终止程序: ").lower()
+        if choice == 'y':
+            print(f"  [信息] 已跳过此行。")
+            return SKIP
+        elif choice == 's':
+            print(f"  [信息] 已跳过批次中剩余的所有行。")
+            return SKIP_REST
+        else:
+            print("  [致命] 用户选择终止程序。")
+            raise single_exception
+
     @abstractmethod
     def transfer_table_data(self, table_name: str):
         """迁移单个表的数据，并处理断点续传。"""
         pass
 
+    def sync_table_changes(self, table_name: str) -> int:
+        """
+        增量同步单个表: 把更新时间晚于水位线的行写入目标库并推进水位线, 返回本次同步的行数。
+        默认不支持, 需要增量同步的迁移类需重写此方法。
+        """
+        raise NotImplementedError(f"{type(self).__name__} 不支持增量同步。")
+
+    @classmethod
+    def supports_incremental(cls) -> bool:
+        """迁移类是否实现了增量同步 (重写了 sync_table_changes)。"""
+        return cls.sync_table_changes is not AbstractDatabaseTransfer.sync_table_changes
+
+    def get_source_time(self) -> Optional[str]:
+        """
+        源库的当前时间 (已减去 incrementalLagSeconds), 全量迁移开始时作为该表的增量水位线。
+        默认返回 None (不记录), 支持增量同步的迁移类需重写此方法。
+        """
+        return None
+
+    def _record_copy_watermark(self, table_name: str):
+        """
+        全量迁移一张表之前, 若该表还没有水位线, 以源库当前时间记录一个;
+        之后的增量同步从全量迁移开始的时间继续, 而不是重新读取整张表。断点续传时保留第一次记录的水位线。
+        """
+        if not self.supports_incremental() or self._get_watermark(table_name) is not None:
+            return
+        source_time = self.get_source_time()
+        if source_time:
+            self._save_watermark(table_name, (str(source_time), 0))
+
     def _filter_tables(self, all_tables: List[str]) -> List[str]:
         """
         根据配置的包含/排除列表过滤需要迁移的表。
@@ -213,20 +512,12 @@ class AbstractDatabaseTransfer(ABC):
             print("已按照依赖关系对迁移顺序进行排序：")
             print(" -> ".join(sorted_tables))
 
-            for table in sorted_tables:
-                print("\n" + "-" * 60)
-                print(f"正在处理表: {table}")
-
-                ddl = self.get_table_ddl(table)
-                self.create_table_in_target(ddl)
-                print(f"  - 表结构 '{table}' 已在目标数据库中确认。")
-
-                self.transfer_table_data(table)
-
-                self.config.alreadyFinished.append(table)
-                self.config.nowTitle = ""
-                self.config.nowLastId = 0
-                print(f"\n  - 表 '{table}' 迁移完成并已标记。")
+            workers = max(1, int(self.config.parallelTables or 1))
+            if workers > 1 and len(sorted_tables) > 1:
+                self._run_parallel(sorted_tables, dependencies, workers)
+            else:
+                for table in sorted_tables:
+                    self._migrate_table(table)
 
             print("\n" + "=" * 60)
             print("数据库迁移过程已成功完成！")
@@ -234,10 +525,144 @@ class AbstractDatabaseTransfer(ABC):
         except Exception as e:
             print(f"\n[致命错误] 迁移过程中发生异常: {e}")
             print("程序已停止，请检查配置和日志。")
-            print(f"最后记录状态: 表='{self.config.nowTitle}', LastID={self.config.nowLastId}")
+            checkpoints = self._checkpoint_summary()
+            if checkpoints:
+                print(f"最后记录状态: {checkpoints}")
+            else:
+                print(f"最后记录状态: 表='{self.config.nowTitle}', LastID={self.config.nowLastId}")
+        finally:
+            self._release_checkpoint_store()
+            self.close_dbs()
+
+    def run_incremental(self, max_rounds: Optional[int] = None):
+        """
+        增量同步模式: 全量迁移完成后持续运行, 每隔 incrementalInterval 秒对已完成全量迁移 (alreadyFinished) 的表
+        调用一次 sync_table_changes, 只同步有变化的行。按 Ctrl+C 停止, 水位线在每批写入后保存, 重新启动时继续。
+        :param max_rounds: 可选, 运行多少轮后退出; 为 None 时一直运行。
+        """
+        if not self.supports_incremental():
+            raise NotImplementedError(f"{type(self).__name__} 不支持增量同步 (未实现 sync_table_changes)。")
+        try:
+            self.connect_dbs()
+            tables = self._incremental_tables(self.get_all_tables())
+            if not tables:
+                print("没有已完成全量迁移的表, 请先运行 run() 完成全量迁移。")
+                return
+            interval = max(0.0, float(self.config.incrementalInterval))
+            print(f"增量同步已启动: {len(tables)} 个表, 每 {interval} 秒一轮 (按 Ctrl+C 停止)。")
+            rounds = 0
+            while max_rounds is None or rounds < max_rounds:
+                rounds += 1
+                started = time.monotonic()
+                changed = {}
+                for table in tables:
+                    count = self.sync_table_changes(table)
+                    if count:
+                        changed[table] = count
+                if self.checkpoint_store is not None:
+                    self.checkpoint_store.flush()
+                summary = ', '.join(f"{table}: {count}" for table, count in changed.items()) or '无变化'
+                print(f"  [增量同步] 第 {rounds} 轮完成, 耗时 {time.monotonic() - started:.1f} 秒 | {summary}")
+                if max_rounds is not None and rounds >= max_rounds:
+                    break
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("\n[信息] 增量同步已停止。")
+        except Exception as e:
+            print(f"\n[致命错误] 增量同步过程中发生异常: {e}")
+            print("程序已停止，各表的水位线已保存在最后一次成功写入的位置。")
         finally:
+            self._release_checkpoint_store()
             self.close_dbs()
 
+    def _incremental_tables(self, all_tables: List[str]) -> List[str]:
+        """按包含/排除规则选出需要增量同步的表, 只包含已完成全量迁移的表。"""
+        finished = set(self.config.alreadyFinished)
+        if self.config.isInclude:
+            candidates = [tbl for tbl in all_tables if tbl in self.config.includeList]
+        else:
+            exclude_set = set(self.config.excludeList)
+            candidates = [tbl for tbl in all_tables if tbl not in exclude_set]
+        pending = [tbl for tbl in candidates if tbl not in finished]
+        if pending:
+            print(f"[警告] 以下表尚未完成全量迁移, 不参与增量同步: {', '.join(pending)}")
+        return [tbl for tbl in candidates if tbl in finished]
+
+    def _migrate_table(self, table: str):
+        """迁移一张表: 确认表结构、迁移数据并标记完成。"""
+        if self._parallel_progress is None:
+            print("\n" + "-" * 60)
+        print(f"正在处理表: {table}")
+
+        ddl = self.get_table_ddl(table)
+        self.create_table_in_target(ddl)
+        print(f"  - 表结构 '{table}' 已在目标数据库中确认。")
+
+        self._record_copy_watermark(table)
+        self.transfer_table_data(table)
+
+        self._mark_table_finished(table)
+        print(f"\n  - 表 '{table}' 迁移完成并已标记。")
+
+    def _run_parallel(self, tables: List[str], dependencies: Dict[str, List[str]], workers: int):
+        """
+        并行迁移调度: 最多 workers 张表同时迁移, 一张表只在其所有外键父表 (本次需要迁移的) 完成后才开始。
+        某张表失败后不再启动新表, 等待进行中的表结束后抛出该异常; 各表断点保存在 tableCheckpoints 中。
+        存在循环依赖而无法继续调度时, 按排序顺序启动下一张表。
+        状态行只在有表开始或结束时打印, 其余时间最多每 _PARALLEL_STATUS_INTERVAL 秒打印一次, 避免刷屏。
+        """
+        table_set = set(tables)
+        parents = {table: {parent for parent in dependencies.get(table, []) if parent in table_set and parent != table}
+                   for table in tables}
+        pending = list(tables)
+        done = set()
+        running = {}
+        failure = None
+        last_state = None
+        last_status_at = 0.0
+        self._parallel_progress = {}
+        print(f"\n--- 并行迁移: 最多 {workers} 张表同时进行 ---")
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mignon-transfer') as executor:
+                while pending or running:
+                    if failure is None:
+                        ready = [table for table in pending if parents[table] <= done]
+                        if not ready and not running and pending:
+                            ready = pending[:1]
+                        for table in ready[:workers - len(running)]:
+                            pending.remove(table)
+                            running[executor.submit(self._migrate_table, table)] = table
+                    elif pending:
+                        print(f"\n[警告] 表迁移失败, 不再启动新表, 等待进行中的 {len(running)} 张表结束...")
+                        pending.clear()
+                    if not running:
+                        break
+                    finished, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        table = running.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            print(f"\n[错误] 表 '{table}' 迁移失败: {error}")
+                            failure = failure or error
+                        else:
+                            done.add(table)
+                        self._parallel_progress.pop(table, None)
+                    state = (len(done), frozenset(running.values()))
+                    now = time.monotonic()
+                    if state != last_state or now - last_status_at >= self._PARALLEL_STATUS_INTERVAL:
+                        self._print_parallel_status(len(done), len(tables))
+                        last_state, last_status_at = state, now
+        finally:
+            self._parallel_progress = None
+        if failure is not None:
+            raise failure
+
+    def _print_parallel_status(self, finished: int, total: int):
+        in_flight = ', '.join(
+            f"{table} {reporter.current * 100 // reporter.total if reporter.total else 0}%"
+            for table, reporter in list(self._parallel_progress.items()))
+        print(f"  [并行迁移] 已完成 {finished}/{total} 张表" + (f" | 进行中: {in_flight}" if in_flight else ""))
+
     def _sort_tables_by_dependencies(self, tables: List[str], dependencies: Dict[str, List[str]]) -> List[str]:
         """
         使用拓扑排序对表进行排序。
@@ -274,21 +699,163 @@ class AbstractDatabaseTransfer(ABC):
 
 
 # --- 3. 针对 MySQL 的具体迁移实现 ---
+class _ColumnPlan(NamedTuple):
+    """一张表的元组迁移方案: 写入列 (已排除生成列)、id 列位置以及需要清理无效值的日期/时间列位置。"""
+    columns: Tuple[str, ...]
+    id_index: int
+    date_indexes: Tuple[int, ...]
+
+    def page_query(self, table_name: str) -> str:
+        column_sql = ', '.join(f'`{col}`' for col in self.columns)
+        return f"SELECT {column_sql} FROM `{table_name}` WHERE id > %s ORDER BY id ASC LIMIT %s;"
+
+    def incremental_query(self, table_name: str, column: str, has_watermark: bool) -> str:
+        """按 (更新时间, id) 的游标读取水位线之后的行, 参数依次为 [更新时间, 更新时间, id,] 延迟秒数, 行数上限。"""
+        column_sql = ', '.join(f'`{col}`' for col in self.columns)
+        after = f"(`{column}` > %s OR (`{column}` = %s AND id > %s))" if has_watermark else f"`{column}` IS NOT NULL"
+        return (f"SELECT {column_sql} FROM `{table_name}` WHERE {after} "
+                f"AND `{column}` <= NOW() - INTERVAL %s SECOND ORDER BY `{column}` ASC, id ASC LIMIT %s;")
+
+    def range_query(self, table_name: str) -> str:
+        column_sql = ', '.join(f'`{col}`' for col in self.columns)
+        return f"SELECT {column_sql} FROM `{table_name}` WHERE id > %s AND id <= %s ORDER BY id ASC LIMIT %s;"
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(items: Iterable, depth: int) -> Iterator:
+    """
+    在后台线程中迭代 items (如按主键分页读取的各批数据), 最多预先读取 depth 项放入有界队列, 调用方按原顺序取用;
+    读取过程中的异常在调用方取到该位置时抛出。调用方提前结束迭代时, 后台线程在当前读取完成后停止。
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(items)
+        error = None
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            error = e
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+        put((_PREFETCH_DONE, error))
+
+    reader = threading.Thread(target=produce, name='mignon-prefetch', daemon=True)
+    reader.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _PREFETCH_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        reader.join()
+
+
+class _KeysetRanges:
+    """
+    一张表拆分出的 id 区间 (last_id, end_id], 每个区间同一时刻只由一个 worker 按主键游标读写。
+    claimed 为已读出 (正在写入) 的最大 id, last 为已写入并记录断点的最大 id;
+    worker 的区间完成后, 从剩余 id 跨度最大的区间中切走后一半 (work stealing), 稀疏区间提前完成的 worker 因此不会空闲。
+    """
+
+    def __init__(self, ranges: List[List[int]], min_split: int):
+        self._lock = threading.Lock()
+        # 每个区间: [last, end, claimed, 是否已分配给 worker]
+        self._ranges = [[last, end, last, False] for last, end in ranges if last < end]
+        self.min_split = max(1, min_split)
+        self.steals = 0
+        self.stopped = False
+
+    def acquire(self) -> Optional[list]:
+        """分配一个未分配的区间; 没有时从其他 worker 的区间切分; 已无可分配的区间或已停止时返回 None。"""
+        with self._lock:
+            if self.stopped:
+                return None
+            for item in self._ranges:
+                if not item[3] and item[2] < item[1]:
+                    item[3] = True
+                    return item
+            victim = max((item for item in self._ranges if item[3]),
+                         key=lambda item: item[1] - item[2], default=None)
+            if victim is None or victim[1] - victim[2] < 2 * self.min_split:
+                return None
+            middle = victim[2] + (victim[1] - victim[2]) // 2
+            stolen = [middle, victim[1], middle, True]
+            victim[1] = middle
+            self._ranges.append(stolen)
+            self.steals += 1
+            return stolen
+
+    def bounds(self, item: list) -> Tuple[int, int]:
+        with self._lock:
+            return item[2], item[1]
+
+    def claim(self, item: list, rows: list, id_index: int, limit: int) -> list:
+        """
+        读出一批行后调用: 截掉已被切走的部分 (id > end), 并把 claimed 推进到本批写入完成后的断点位置。
+        读出的行数不足 limit 时区间已读完, claimed 直接推进到 end。
+        """
+        with self._lock:
+            end = item[1]
+            if rows and rows[-1][id_index] > end:
+                rows = [row for row in rows if row[id_index] <= end]
+            item[2] = end if len(rows) < limit or not rows else rows[-1][id_index]
+            return rows
+
+    def commit(self, item: list) -> Tuple[List[List[int]], int]:
+        """本批写入完成后调用, 返回需要保存的未完成区间断点以及剩余的 id 跨度。"""
+        with self._lock:
+            item[0] = item[2]
+            pending = [[last, end] for last, end, _, _ in self._ranges if last < end]
+            return pending, sum(end - last for last, end in pending)
+
+    def release(self, item: list):
+        with self._lock:
+            item[3] = False
+
+    def stop(self):
+        with self._lock:
+            self.stopped = True
+
+
 class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
     """
     针对 MySQL -> MySQL 迁移的具体实现。
     """
     def connect_dbs(self):
         """使用 MySQLManager 连接池来建立连接。"""
+        # 并行迁移时每张进行中的表 (每个 id 区间) 各占用一个源连接和一个目标连接
+        pool_size = max(5, int(self.config.parallelTables or 1) * int(self.config.rangeSplits or 1) + 1)
         print("正在使用 MySQLManager 连接到源数据库...")
         self.source_db = MysqlManager(
             host=self.config.host, user=self.config.userName, password=self.config.password,
-            database=self.config.needToTransferredDataBase, port=self.config.port
+            database=self.config.needToTransferredDataBase, port=self.config.port, pool_size=pool_size
         )
         print("正在使用 MySQLManager 连接到目标数据库...")
         self.target_db = MysqlManager(
             host=self.config.targetHost, user=self.config.targetUserName, password=self.config.targetPassword,
-            database=self.config.targetDataBase, port=self.config.targetPort
+            database=self.config.targetDataBase, port=self.config.targetPort, pool_size=pool_size,
+            bulk_insert=bool(self.config.bulkInsert)
         )
 
     def close_dbs(self):
@@ -320,6 +887,27 @@ class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
                 result = cursor.fetchone()
         return result['max_id'] if result and result['max_id'] is not None else 0
 
+    def get_min_id(self, table_name: str) -> int:
+        query = f"SELECT MIN(id) as min_id FROM `{table_name}`;"
+        if hasattr(self.source_db, 'pool'):
+            result = self.source_db.fetch_one(query)
+        else:
+            with self.source_db.connection.cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchone()
+        return result['min_id'] if result and result['min_id'] is not None else 1
+
+    def get_source_time(self) -> Optional[str]:
+        lag = int(self.config.incrementalLagSeconds or 0)
+        query = f"SELECT NOW() - INTERVAL {lag} SECOND AS now;"
+        if hasattr(self.source_db, 'pool'):
+            result = self.source_db.fetch_one(query)
+        else:
+            with self.source_db.connection.cursor() as cursor:
+                cursor.execute(query)
+                result = cursor.fetchone()
+        return str(result['now']) if result and result['now'] is not None else None
+
     def get_table_ddl(self, table_name: str) -> str:
         query = f"SHOW CREATE TABLE `{table_name}`;"
         result = None
@@ -412,8 +1000,45 @@ class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
             print(f"\n[警告] 无法获取表 '{table_name}' 的生成列信息。错误: {e}")
             return []
 
+    # 需要清理无效值 (0000-00-00 等) 的日期/时间列类型
+    _DATE_DATA_TYPES = {'date', 'datetime', 'timestamp'}
+
+    def _get_column_plan(self, table_name: str, generated_columns: list) -> Optional[_ColumnPlan]:
+        """
+        从源库 INFORMATION_SCHEMA 按列顺序读取一次表结构, 生成该表的元组迁移方案 (结果按表缓存)。
+        源/目标管理器不支持元组读写 (fetch_rows / upsert_tuples), 或无法确定 id 列时返回 None, 由调用方使用字典方式迁移。
+        """
+        if table_name in self._column_plan_cache:
+            return self._column_plan_cache[table_name]
+        plan = None
+        if hasattr(self.source_db, 'fetch_rows') and hasattr(self.target_db, 'upsert_tuples'):
+            query = """
+                    SELECT COLUMN_NAME AS column_name, DATA_TYPE AS data_type
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                    """
+            try:
+                results = self.source_db.fetch_all(query, (self.config.needToTransferredDataBase, table_name))
+            except Exception as e:
+                print(f"\n[警告] 无法获取表 '{table_name}' 的列信息, 将使用字典方式迁移。错误: {e}")
+                results = []
+            generated = set(generated_columns)
+            kept = [row for row in results if row['column_name'] not in generated]
+            columns = tuple(row['column_name'] for row in kept)
+            if 'id' in columns:
+                plan = _ColumnPlan(
+                    columns=columns,
+                    id_index=columns.index('id'),
+                    date_indexes=tuple(index for index, row in enumerate(kept)
+                                       if str(row['data_type']).lower() in self._DATE_DATA_TYPES)
+                )
+        self._column_plan_cache[table_name] = plan
+        return plan
+
     def transfer_table_data(self, table_name: str):
-        self.config.nowTitle = table_name
+        if self._parallel_progress is None:
+            self.config.nowTitle = table_name
         try:
             max_id = int(self.get_max_id(table_name) or 0)
         except (TypeError, ValueError) as e:
@@ -427,7 +1052,7 @@ class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
 
         print(f"  - 表 '{table_name}' 最大ID为: {max_id}。开始数据迁移...")
 
-        last_id = self.config.nowLastId
+        last_id = self._get_checkpoint(table_name)
         if last_id > 0:
             print(f"  - 从上次断点恢复, last ID: {last_id}")
 
@@ -435,24 +1060,35 @@ class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
         if generated_columns:
             print(f"  [信息] 表 '{table_name}' 包含以下生成列，将从插入数据中自动排除: {', '.join(generated_columns)}")
 
-        while last_id < max_id:
-            query = f"SELECT * FROM `{table_name}` WHERE id > %s ORDER BY id ASC LIMIT %s;"
-            params = (last_id, self.config.batchSize)
-
-            data_batch = None
-            if hasattr(self.source_db, 'pool'):
-                data_batch = self.source_db.fetch_all(query, params)
+        progress = self._create_progress(table_name, max_id)
+        plan = self._get_column_plan(table_name, generated_columns)
+        if plan is not None:
+            ranges = self._plan_ranges(table_name, max_id, last_id)
+            if ranges:
+                self._transfer_table_ranges(table_name, max_id, ranges, plan, progress)
+            elif self.config.streamRead and hasattr(self.source_db, 'stream_rows'):
+                self._transfer_table_streaming(table_name, max_id, last_id, plan, progress)
             else:
-                with self.source_db.connection.cursor() as cursor:
-                    cursor.execute(query, params)
-                    data_batch = cursor.fetchall()
+                self._transfer_table_tuples(table_name, max_id, last_id, plan, progress)
+            progress.close()
+            return
+        if self.config.streamRead:
+            print("  [警告] 当前的源/目标数据库管理器不支持流式读取, 将使用常规分页读取。")
+        if int(self.config.rangeSplits or 1) > 1:
+            print("  [警告] 当前的源/目标数据库管理器不支持元组读写, 无法拆分 id 区间, 将按单个游标迁移。")
 
-            if not data_batch:
-                bar = '█' * 40
-                sys.stdout.write(f'\r|{bar}| 100.0% ({max_id}/{max_id})  本批: [0]')
-                sys.stdout.flush()
-                break
+        query = f"SELECT * FROM `{table_name}` WHERE id > %s ORDER BY id ASC LIMIT %s;"
 
+        def read_page(after_id: int) -> list:
+            params = (after_id, self._current_batch_size())
+            if hasattr(self.source_db, 'pool'):
+                return self.source_db.fetch_all(query, params)
+            with self.source_db.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+
+        pages = self._keyset_pages(read_page, last_id, max_id, lambda row: row['id'])
+        for data_batch in self._pipelined(pages):
             cleaned_data_batch = [self._clean_zero_dates(row) for row in data_batch]
 
             final_data_batch = []
@@ -460,52 +1096,263 @@ class MySQLToMySQLTransfer(AbstractDatabaseTransfer):
                 for row in cleaned_data_batch:
                     row_copy = row.copy()
                     for col in generated_columns:
-                        if col in row_copy:
-                            if col in row_copy:
-                                del row_copy[col]
+                        row_copy.pop(col, None)
                     final_data_batch.append(row_copy)
             else:
                 final_data_batch = cleaned_data_batch
 
-            try:
-                self.target_db.upsert_batch(data_list=final_data_batch, table_name=table_name)
-            except Exception as batch_exception:
-                print(f"\n[警告] 批量写入失败 (表: {table_name})。错误: {batch_exception}")
-                print("--- 即将进入逐行恢复模式 ---")
-
-                for row_data in final_data_batch:
-                    try:
-                        self.target_db.upsert_single(row_data, table_name)
-                    except Exception as single_exception:
-                        row_id = row_data.get('id', 'N/A')
-                        print("\n" + "=" * 80)
-                        print(f"[错误] 定位到错误行!\n  - 表名: {table_name}\n  - ID: {row_id}\n  - 错误: {single_exception}\n  - 数据: {row_data}")
-                        print("=" * 80)
-
-                        if self.config.autoSkipError:
-                            print(f"  [信息] 配置了自动跳过，已跳过此行。")
-                            continue
-
-                        choice = input("输入 'y' 跳过此行，'s' 跳过本批次剩余所有行，其他任意键将终止程序: ").lower()
-                        if choice == 'y':
-                            print(f"  [信息] 已跳过此行。")
-                            continue
-                        elif choice == 's':
-                            print(f"  [信息] 已跳过批次中剩余的所有行。")
-                            break
-                        else:
-                            print("  [致命] 用户选择终止程序。")
-                            raise single_exception
-                print("--- 逐行恢复模式结束 ---")
+            self._write_batch_with_recovery(
+                table_name, final_data_batch,
+                write_batch=lambda rows: self.target_db.upsert_batch(data_list=rows, table_name=table_name),
+                write_single=lambda row_data: self.target_db.upsert_single(row_data, table_name),
+                describe_row=lambda row_data: row_data
+            )
 
             last_id_in_batch = data_batch[-1]['id']
             last_id = last_id_in_batch
-            self.config.nowLastId = last_id
+            self._save_checkpoint(table_name, last_id)
+
+            progress.update(last_id, f"本批: [{len(data_batch)}]")
+        if last_id < max_id:
+            progress.update(max_id, "本批: [0]", force=True)
+        progress.close()
+
+    @staticmethod
+    def _keyset_pages(read_page: Callable[[int], Any], last_id: int, max_id: int,
+                      id_of: Callable[[Any], int]) -> Iterator:
+        """按主键游标依次读取各批数据 (read_page(after_id) 返回 id > after_id 的一批行), 直到读完或超过 max_id。"""
+        while last_id < max_id:
+            rows = read_page(last_id)
+            if not rows:
+                return
+            yield rows
+            last_id = id_of(rows[-1])
+
+    def _pipelined(self, pages: Iterator) -> Iterator:
+        """
+        pipelineDepth > 0 时由后台线程预读后续批次, 源库读取与目标库写入同时进行。
+        预读只推进读取游标; 断点仍然只在对应批次写入 (提交) 成功后由调用方保存。
+        """
+        depth = int(self.config.pipelineDepth or 0)
+        return _prefetch(pages, depth) if depth > 0 else pages
+
+    def sync_table_changes(self, table_name: str) -> int:
+        """
+        按 incrementalColumn (默认 updated_at) 的水位线增量同步: 以 (更新时间, id) 为游标读取变化的行,
+        经与全量迁移相同的元组写入路径 (upsert) 写入目标库, 每批写入成功后推进水位线。
+        不会同步源库中已删除的行, 更新时间为 NULL 的行也不会被同步。
+        """
+        column = self.config.incrementalColumn or 'updated_at'
+        generated_columns = self._get_generated_columns(self.target_db, self.config.targetDataBase, table_name)
+        plan = self._get_column_plan(table_name, generated_columns)
+        if plan is None or column not in plan.columns:
+            if table_name not in self._incremental_skipped:
+                self._incremental_skipped.add(table_name)
+                print(f"  [警告] 表 '{table_name}' 没有 '{column}' 列 (或不支持元组读写), 跳过增量同步。")
+            return 0
+        column_index = plan.columns.index(column)
+        lag = int(self.config.incrementalLagSeconds or 0)
+        watermark = self._get_watermark(table_name)
+        if watermark is None and self.config.incrementalStartAt:
+            watermark = (str(self.config.incrementalStartAt), 0)
+
+        synced = 0
+        while True:
+            limit = self._current_batch_size()
+            if watermark is None:
+                rows = self.source_db.fetch_rows(plan.incremental_query(table_name, column, False), (lag, limit))
+            else:
+                value, last_id = watermark
+                rows = self.source_db.fetch_rows(plan.incremental_query(table_name, column, True),
+                                                 (value, value, last_id, lag, limit))
+            if not rows:
+                break
+            self._write_tuples(table_name, plan, rows)
+
+            last_row = rows[-1]
+            watermark = (str(last_row[column_index]), last_row[plan.id_index])
+            self._save_watermark(table_name, watermark)
+            synced += len(rows)
+            if len(rows) < limit:
+                break
+        return synced
+
+    def _plan_ranges(self, table_name: str, max_id: int, last_id: int) -> List[List[int]]:
+        """
+        返回需要按区间并行迁移的 [last_id, end_id] 列表; 不拆分时返回空列表。
+        已有区间断点时从断点恢复; 否则在 rangeSplits > 1 且剩余 id 跨度足够大时, 把 [max(min_id, last_id + 1), max_id] 均分为 rangeSplits 段。
+        """
+        ranges = self._get_range_checkpoints(table_name)
+        if ranges:
+            print(f"  - 从上次的区间断点恢复, 剩余 {len(ranges)} 个区间。")
+            return ranges
+        splits = int(self.config.rangeSplits or 1)
+        if splits <= 1:
+            return []
+        start = max(int(self.get_min_id(table_name) or 1) - 1, last_id)
+        span = max_id - start
+        if span < splits * self._current_batch_size():
+            return []
+        step = -(-span // splits)
+        ranges = [[start + i * step, min(max_id, start + (i + 1) * step)] for i in range(splits)]
+        return [item for item in ranges if item[0] < item[1]]
+
+    def _transfer_table_ranges(self, table_name: str, max_id: int, ranges: List[List[int]], plan: _ColumnPlan,
+                               progress: ProgressReporter):
+        """
+        把 id 区间分给 rangeSplits 个 worker 并行迁移, 每个 worker 在自己的区间内按主键游标分页读取并以元组写入,
+        每批写入后保存所有未完成区间的断点 (rangeCheckpoints); 任一 worker 失败时其余 worker 在当前批次后停止, 然后抛出该异常。
+        """
+        workers = max(1, int(self.config.rangeSplits or 1))
+        keyset = _KeysetRanges(ranges, self._current_batch_size())
+        query = plan.range_query(table_name)
+        covered_end = max(end for _, end in ranges)
+        print(f"  - id 区间拆分: {len(ranges)} 个区间, {workers} 个 worker 并行迁移。")
+        self._save_range_checkpoints(table_name, ranges)
+
+        progress_lock = threading.Lock()
+
+        def worker():
+            try:
+                work()
+            except Exception:
+                keyset.stop()
+                raise
+
+        def work():
+            item = keyset.acquire()
+            while item is not None:
+                last_id, end_id = keyset.bounds(item)
+                if last_id >= end_id:
+                    keyset.release(item)
+                    item = keyset.acquire()
+                    continue
+                limit = self._current_batch_size()
+                rows = keyset.claim(item, self.source_db.fetch_rows(query, (last_id, end_id, limit)),
+                                    plan.id_index, limit)
+                if rows:
+                    self._write_tuples(table_name, plan, rows)
+                pending, remaining = keyset.commit(item)
+                if not pending:
+                    # 所有区间已写完: 先把整表断点推进到区间末尾, 再清空区间断点;
+                    # 在标记表完成之前中断时, 重启会从该断点继续, 而不是重新规划区间、再次复制整张表
+                    self._save_checkpoint(table_name, covered_end)
+                self._save_range_checkpoints(table_name, pending)
+                with progress_lock:
+                    progress.update(max_id - remaining, f"本批: [{len(rows)}]")
+                if keyset.stopped:
+                    return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'mignon-range-{table_name}') as executor:
+            futures = [executor.submit(worker) for _ in range(workers)]
+            failure = None
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    failure = failure or e
+        if failure is not None:
+            raise failure
+        progress.update(max_id, f"区间切分: {keyset.steals} 次", force=True)
+
+    def _write_batch_with_recovery(self, table_name: str, rows: list, write_batch, write_single, describe_row):
+        """
+        写入一批数据 (字典或元组), 记录自适应批量的耗时; 失败时进入二分定位恢复模式。
+        describe_row 把一行转换为字典, 用于错误行的提示。
+        """
+        try:
+            started = time.perf_counter()
+            # 目标库连接熔断时在这里暂停读取源表, 恢复后重试本批
+            call_when_available(self.target_db, lambda: write_batch(rows))
+            if self.batch_sizer:
+                self.batch_sizer.record(len(rows), time.perf_counter() - started, estimate_rows_bytes(rows))
+        except Exception as batch_exception:
+            if self.batch_sizer and self.batch_sizer.record_error(batch_exception):
+                print(f"\n[信息] 批量大小已调整为 {self.batch_sizer.size}。")
+            print(f"\n[警告] 批量写入失败 (表: {table_name})。错误: {batch_exception}")
+            print("--- 即将进入二分定位恢复模式 ---")
+            attempts = bisect_write(
+                rows,
+                write_batch=lambda sub_rows: call_when_available(self.target_db, lambda: write_batch(sub_rows)),
+                write_single=lambda row: call_when_available(self.target_db, lambda: write_single(row)),
+                on_row_error=lambda row, e: self._handle_row_error(table_name, describe_row(row), e)
+            )
+            print(f"--- 恢复模式结束 (本批 {len(rows)} 行, 共执行 {attempts} 次写入) ---")
+
+    @staticmethod
+    def _clean_zero_dates_tuple(row: tuple, date_indexes: list) -> tuple:
+        """_clean_zero_dates 的元组版本, 只检查日期/时间类型的列, 没有无效值时原样返回。"""
+        cleaned = None
+        for index in date_indexes:
+            value = row[index]
+            if value is None:
+                continue
+            if isinstance(value, str):
+                invalid = value.startswith('0000-00-00')
+            else:
+                invalid = value.year < 1000  # MySQL DATE/DATETIME 有效年份从 1000 开始
+            if invalid:
+                if cleaned is None:
+                    cleaned = list(row)
+                cleaned[index] = None
+        return row if cleaned is None else tuple(cleaned)
+
+    def _write_tuples(self, table_name: str, plan: _ColumnPlan, rows: list):
+        if plan.date_indexes:
+            rows = [self._clean_zero_dates_tuple(row, plan.date_indexes) for row in rows]
+        columns = plan.columns
+        self._write_batch_with_recovery(
+            table_name, rows,
+            write_batch=lambda sub_rows: self.target_db.upsert_tuples(table_name, columns, sub_rows),
+            write_single=lambda row: self.target_db.upsert_tuples(table_name, columns, [row]),
+            describe_row=lambda row: dict(zip(columns, row))
+        )
 
-            percentage = min(1.0, last_id / max_id)
-            bar = '█' * int(40 * percentage) + '-' * (40 - int(40 * percentage))
-            sys.stdout.write(f'\r|{bar}| {percentage:.1%} ({last_id}/{max_id})  本批: [{len(data_batch)}]')
-            sys.stdout.flush()
+    def _transfer_table_tuples(self, table_name: str, max_id: int, last_id: int, plan: _ColumnPlan,
+                               progress: ProgressReporter):
+        """按主键分页读取元组行 (只查询写入列), 只清理日期/时间列后直接以元组写入目标库。"""
+        query = plan.page_query(table_name)
+        pages = self._keyset_pages(lambda after_id: self.source_db.fetch_rows(query, (after_id, self._current_batch_size())),
+                                   last_id, max_id, lambda row: row[plan.id_index])
+        for rows in self._pipelined(pages):
+            batch_last_id = rows[-1][plan.id_index]
+            self._write_tuples(table_name, plan, rows)
+
+            last_id = batch_last_id
+            self._save_checkpoint(table_name, last_id)
+            progress.update(last_id, f"本批: [{len(rows)}]")
+        if last_id < max_id:
+            progress.update(max_id, "本批: [0]", force=True)
+
+    def _transfer_table_streaming(self, table_name: str, max_id: int, last_id: int, plan: _ColumnPlan,
+                                  progress: ProgressReporter):
+        """
+        streamRead 模式: 按主键分页 (每页 streamPageSize 行), 页内通过服务端游标按批读取元组行,
+        直接以元组写入目标库, 客户端内存中最多保留一个批次 (开启 pipelineDepth 时为 pipelineDepth + 2 个)。
+        注意: 写入期间源库会等待客户端继续读取, 单批写入 (含熔断等待) 不应超过源库的 net_write_timeout。
+        """
+        page_size = max(1, int(self.config.streamPageSize or 100000))
+        query = plan.page_query(table_name)
+
+        def stream_batches(after_id: int) -> Iterator:
+            while after_id < max_id:
+                page_rows = 0
+                for _, rows in self.source_db.stream_rows(query, (after_id, page_size), self._current_batch_size()):
+                    page_rows += len(rows)
+                    after_id = rows[-1][plan.id_index]
+                    yield rows
+                if page_rows < page_size:
+                    return
+
+        for rows in self._pipelined(stream_batches(last_id)):
+            batch_last_id = rows[-1][plan.id_index]
+            self._write_tuples(table_name, plan, rows)
+
+            last_id = batch_last_id
+            self._save_checkpoint(table_name, last_id)
+            progress.update(last_id, f"本批: [{len(rows)}]")
+        if last_id < max_id:
+            progress.update(max_id, "本批: [0]", force=True)
 
 # --- 4. Eazy Mode Web 应用 ---
 class TransferEazyAppRunner:
@@ -854,6 +1701,20 @@ class TransferEazyAppRunner:
                 except (json.JSONDecodeError, IOError):
                     pass
             final_config["batchSize"] = existing_config.get("batchSize", 1000)
+            final_config["bulkInsert"] = existing_config.get("bulkInsert", False)
+            final_config["adaptiveBatch"] = existing_config.get("adaptiveBatch", False)
+            final_config["streamRead"] = existing_config.get("streamRead", False)
+            final_config["parallelTables"] = existing_config.get("parallelTables", 1)
+            final_config["tableCheckpoints"] = {}
+            final_config["rangeSplits"] = existing_config.get("rangeSplits", 1)
+            final_config["pipelineDepth"] = existing_config.get("pipelineDepth", 0)
+            final_config["checkpointFlushBatches"] = existing_config.get("checkpointFlushBatches", 100)
+            final_config["checkpointFlushSeconds"] = existing_config.get("checkpointFlushSeconds", 5.0)
+            final_config["incrementalColumn"] = existing_config.get("incrementalColumn", "updated_at")
+            final_config["incrementalInterval"] = existing_config.get("incrementalInterval", 10.0)
+            final_config["incrementalLagSeconds"] = existing_config.get("incrementalLagSeconds", 5)
+            final_config["tableWatermarks"] = {}
+            final_config["rangeCheckpoints"] = {}
 
             try:
                 os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
@@ -875,8 +1736,14 @@ class DatabaseTransferRunner:
     """
     DEFAULT_CONFIG_PATH = "./resources/config/dataBaseTransfer.json"
 
-    def __init__(self, config_path: Optional[str] = None, eazy: bool = False):
+    def __init__(self, config_path: Optional[str] = None, eazy: bool = False, checkpoint_path: Optional[str] = None):
+        """
+        :param config_path: 配置文件路径, 默认为 ./resources/config/dataBaseTransfer.json。
+        :param eazy: 是否启动 Eazy Mode 可视化配置界面。
+        :param checkpoint_path: 断点存储 (SQLite) 的路径, 默认与配置文件同目录, 扩展名为 .checkpoints.db。
+        """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
+        self.checkpoint_path = checkpoint_path or _default_checkpoint_path(self.config_path)
         self.eazy = eazy
 
         if not self.eazy:
@@ -892,7 +1759,12 @@ class DatabaseTransferRunner:
                 "targetUserName": "root", "targetPassword": "password", "targetHost": "localhost",
                 "targetPort": 3306, "excludeList": ["some_log_table"], "alreadyFinished": [],
                 "nowTitle": "", "nowLastId": 0, "isInclude": True, "includeList": [],
-                "batchSize": 1000, "autoSkipError": False
+                "batchSize": 1000, "autoSkipError": False, "bulkInsert": False,
+                "adaptiveBatch": False, "streamRead": False, "parallelTables": 1,
+                "tableCheckpoints": {}, "rangeSplits": 1, "rangeCheckpoints": {},
+                "pipelineDepth": 0, "checkpointFlushBatches": 100, "checkpointFlushSeconds": 5.0,
+                "incrementalColumn": "updated_at", "incrementalInterval": 10.0, "incrementalLagSeconds": 5,
+                "incrementalStartAt": "", "tableWatermarks": {}
             }
             temp_manager = JsonConfigManager(self.config_path)
             temp_manager.data = default_config
@@ -900,10 +1772,12 @@ class DatabaseTransferRunner:
             print("配置模板已创建。请填写您的数据库信息后再次运行。")
             sys.exit(0)
 
-    def run(self, transfer_class: Type[AbstractDatabaseTransfer] = MySQLToMySQLTransfer):
+    def run(self, transfer_class: Type[AbstractDatabaseTransfer] = MySQLToMySQLTransfer, incremental: bool = False,
+            max_rounds: Optional[int] = None):
         """
         加载配置，实例化指定的迁移类，并执行迁移。
         如果 eazy=True，则启动 Eazy Mode Web UI。
+        如果 incremental=True，则对已完成全量迁移的表持续进行增量同步 (max_rounds 轮后退出, 为 None 时一直运行)。
         """
         if self.eazy:
             if not Flask:
@@ -928,15 +1802,33 @@ class DatabaseTransferRunner:
             print(f"请更新 '{self.config_path}' 中的数据库信息，或使用 '--eazy' 标志启动 Eazy Mode 生成配置。")
             return
 
-        print(f"配置已加载。正在使用 '{transfer_class.__name__}' 开始迁移...")
-        transfer_instance = transfer_class(config_proxy)
-        transfer_instance.run()
+        if incremental and not transfer_class.supports_incremental():
+            print(f"[错误] '{transfer_class.__name__}' 不支持增量同步 (未实现 sync_table_changes), 无法使用 incremental=True。")
+            return
+
+        mode = "增量同步" if incremental else "迁移"
+        print(f"配置已加载。正在使用 '{transfer_class.__name__}' 开始{mode}...")
+        # 断点保存在独立的 SQLite 存储中按批落盘, 不再每批重写配置文件; 配置文件中已有的断点仍作为初始值
+        checkpoint_store = CheckpointStore(self.checkpoint_path,
+                                           flush_every=int(config_proxy.checkpointFlushBatches or 100),
+                                           flush_interval=float(config_proxy.checkpointFlushSeconds or 5.0))
+        try:
+            # 构造后再设置断点存储, 兼容 __init__ 只接受 config 的自定义迁移类
+            transfer_instance = transfer_class(config_proxy)
+            transfer_instance.checkpoint_store = checkpoint_store
+            if incremental:
+                transfer_instance.run_incremental(max_rounds=max_rounds)
+            else:
+                transfer_instance.run()
+        finally:
+            checkpoint_store.close()
 
 
 if __name__ == '__main__':
     is_eazy_mode = '--eazy' in sys.argv
+    is_incremental = '--incremental' in sys.argv
 
     runner = DatabaseTransferRunner(eazy=is_eazy_mode)
-    runner.run()
+    runner.run(incremental=is_incremental)
 
 
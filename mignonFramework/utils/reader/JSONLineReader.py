@@ -1,15 +1,148 @@
 from mignonFramework.utils.reader.BaseReader import  BaseReader
+from mignonFramework.utils.reader.LineDecoder import LineDecoder
 from typing import List, Iterator, Tuple, Dict, Any, Optional
 import os
 import json as std_json
-import ast
 import random
+import bisect
+import hashlib
+import time
+
+
+class _LineOffsetIndex:
+    """
+    稀疏的行号 -> 字节偏移索引, 指定 index_dir 时以 JSON 侧车文件的形式保存在其中, 否则只保存在内存中。
+    检查点按行号递增追加, 相邻检查点至少间隔 interval 行; 文件大小或修改时间变化后索引自动失效。
+    """
+
+    def __init__(self, index_path: str, size: int, mtime_ns: int, interval: int):
+        self.index_path = index_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.interval = interval
+        self.lines: List[int] = [1]
+        self.offsets: List[int] = [0]
+        self.total_lines: Optional[int] = None
+        self._dirty = False
+        self._last_save = 0.0
+
+    @classmethod
+    def load(cls, file_path: str, index_dir: str, interval: int) -> '_LineOffsetIndex':
+        stat = os.stat(file_path)
+        digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:12]
+        index_path = os.path.join(index_dir, f"{os.path.basename(file_path)}.{digest}.idx")
+        index = cls(index_path, stat.st_size, stat.st_mtime_ns, interval)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = std_json.load(f)
+            if data.get('size') == stat.st_size and data.get('mtime_ns') == stat.st_mtime_ns:
+                index.lines = [line for line, _ in data['checkpoints']]
+                index.offsets = [offset for _, offset in data['checkpoints']]
+                index.total_lines = data.get('total_lines')
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return index
+
+    def nearest(self, line_number: int) -> Tuple[int, int]:
+        """返回不大于 line_number 的最近检查点 (行号, 字节偏移)。"""
+        i = bisect.bisect_right(self.lines, line_number) - 1
+        return self.lines[i], self.offsets[i]
+
+    def add(self, line_number: int, offset: int):
+        if line_number - self.lines[-1] >= self.interval:
+            self.lines.append(line_number)
+            self.offsets.append(offset)
+            self._dirty = True
+            if time.monotonic() - self._last_save > 5:
+                self.save()
+
+    def set_total(self, total_lines: int):
+        if self.total_lines != total_lines:
+            self.total_lines = total_lines
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty or not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                std_json.dump({'size': self.size, 'mtime_ns': self.mtime_ns, 'total_lines': self.total_lines,
+                               'checkpoints': list(zip(self.lines, self.offsets))}, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except OSError as e:
+            print(f"[WARNING] 无法保存行偏移索引 '{self.index_path}': {e}")
+
 
 class JsonLineReader(BaseReader):
     """
     一个具体的Reader实现，用于读取逐行JSON格式的文件（.json, .txt）。
+    读取时会记录稀疏的 (行号, 字节偏移) 检查点, 使 start_line 续传可以直接 seek 到最近的检查点。
+    文件以二进制方式读取, 只有 \\n 被视为换行 (\\r\\n 行尾的 \\r 在解析时作为空白忽略);
+    只用单独的 \\r 换行的旧式文件会被当作一整行。
     """
 
+    def __init__(self, path: str, checkpoint_interval: int = 100000, index_dir: Optional[str] = None,
+                 json_backend: str = 'auto'):
+        """
+        Args:
+            path (str): 要读取的文件路径或目录路径。
+            checkpoint_interval (int): 相邻两个偏移检查点之间的最小行数。
+            index_dir (Optional[str]): 偏移索引侧车文件的存放目录。默认为 None, 索引只保存在内存中,
+                                       不会写入任何文件; 指定目录后索引跨进程复用, 再次续传时无需重新扫描。
+            json_backend (str): JSON 解析后端, 'auto' 时优先使用已安装的 orjson / msgspec。
+        """
+        super().__init__(path)
+        self.checkpoint_interval = checkpoint_interval
+        self.index_dir = index_dir
+        self.json_backend = json_backend
+        self._indexes: Dict[str, _LineOffsetIndex] = {}
+        # 每个文件独立判断内容是 JSON 还是 Python 字面量
+        self._decoders: Dict[str, LineDecoder] = {}
+
+    def _get_index(self, file_path: str) -> _LineOffsetIndex:
+        index = self._indexes.get(file_path)
+        stat = os.stat(file_path)
+        if index is None or index.size != stat.st_size or index.mtime_ns != stat.st_mtime_ns:
+            if self.index_dir:
+                index = _LineOffsetIndex.load(file_path, self.index_dir, self.checkpoint_interval)
+            else:
+                index = _LineOffsetIndex('', stat.st_size, stat.st_mtime_ns, self.checkpoint_interval)
+            self._indexes[file_path] = index
+        return index
+
+    def _seek_line(self, f, index: _LineOffsetIndex, target_line: int) -> Tuple[int, int]:
+        """
+        将二进制文件对象定位到 target_line 的行首, 返回 (实际到达的行号, 字节偏移)。
+        先跳到最近的检查点, 余下部分按大块统计换行符, 途经的块边界同时记录为新的检查点。
+        """
+        line_num, line_offset = index.nearest(target_line)
+        f.seek(line_offset)
+        read_pos = line_offset
+        while line_num < target_line:
+            block = f.read(1024 * 1024)
+            if not block:
+                break
+            newlines = block.count(b'\n')
+            if line_num + newlines < target_line:
+                if newlines:
+                    line_num += newlines
+                    line_offset = read_pos + block.rfind(b'\n') + 1
+                    index.add(line_num, line_offset)
+                read_pos += len(block)
+                continue
+            pos = 0
+            while line_num < target_line:
+                pos = block.index(b'\n', pos) + 1
+                line_num += 1
+            line_offset = read_pos + pos
+            break
+        f.seek(line_offset)
+        return line_num, line_offset
+
     def _discover_files(self) -> List[str]:
         """
         发现路径下所有以 .json 或 .txt 结尾的文件。
@@ -21,69 +154,200 @@ class JsonLineReader(BaseReader):
             return [self.path]
         return []
 
-    def _safe_json_load(self, text: str) -> Optional[Dict]:
+    def _get_decoder(self, file_path: Optional[str] = None) -> LineDecoder:
+        decoder = self._decoders.get(file_path)
+        if decoder is None:
+            decoder = self._decoders[file_path] = LineDecoder(self.json_backend)
+        return decoder
+
+    def _safe_json_load(self, text: str, file_path: Optional[str] = None) -> Optional[Dict]:
         """
         安全地将字符串解析为JSON，支持标准JSON和Python字面量。
+        传入 file_path 时使用该文件的解码器, 格式判断结果在同一文件内保持。
         """
-        try:
-            return std_json.loads(text)
-        except std_json.JSONDecodeError:
-            try:
-                return ast.literal_eval(text)
-            except (ValueError, SyntaxError, MemoryError, TypeError):
-                return None
+        return self._get_decoder(file_path).decode_or_none(text)
 
     def read_file(self, file_path: str, start_line: int = 1) -> Iterator[Tuple[Dict[str, Any], int]]:
         """
         从指定的JSON行文件中读取数据。
+        start_line > 1 时借助偏移索引直接 seek, 而不是逐行丢弃之前的内容。
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                if line_num < start_line:
-                    continue
-                if not line.strip():
-                    continue
+        index = self._get_index(file_path)
+        with open(file_path, 'rb') as f:
+            try:
+                line_num, offset = self._seek_line(f, index, start_line)
+                next_checkpoint = index.lines[-1] + index.interval
+                for raw in f:
+                    if line_num >= next_checkpoint:
+                        index.add(line_num, offset)
+                        next_checkpoint = index.lines[-1] + index.interval
+                    offset += len(raw)
+                    current_line, line_num = line_num, line_num + 1
+                    if current_line < start_line:
+                        continue
+                    line = raw.decode('utf-8')
+                    if not line.strip():
+                        continue
+
+                    if json_data := self._safe_json_load(line, file_path):
+                        yield json_data, current_line
+                    else:
+                        # 可以在这里决定是跳过还是抛出异常
+                        # 为了保持与原逻辑一致，我们在处理器层处理异常
+                        raise ValueError("JSON 解析失败或为空")
+                index.set_total(line_num - 1)
+            finally:
+                index.save()
+
+    def get_total_items(self, file_path: str) -> int:
+        """
+        获取文件的总行数, 偏移索引中已记录完整行数时直接返回, 无需重新统计。
+        """
+        total_lines = self._get_index(file_path).total_lines
+        if total_lines is not None:
+            return total_lines
+        return super().get_total_items(file_path)
+
+    def get_line_ranges(self, file_path: str, chunk_bytes: int = 8 * 1024 * 1024,
+                        start_line: int = 1) -> List[Tuple[int, int, int, int]]:
+        """
+        以二进制方式快速扫描文件, 将其切分为按行对齐的字节区间, 供多进程并行解析使用。
+        扫描从 start_line 之前最近的检查点开始, 区间边界同时记录进偏移索引。
 
-                if json_data := self._safe_json_load(line):
-                    yield json_data, line_num
+        Returns:
+            List[Tuple[int, int, int, int]]: (起始偏移, 结束偏移, 区间首行行号, 区间行数) 的列表。
+        """
+        ranges = []
+        index = self._get_index(file_path)
+        first_line, offset = index.nearest(start_line)
+        with open(file_path, 'rb') as f:
+            while True:
+                index.add(first_line, offset)
+                f.seek(offset)
+                block = f.read(chunk_bytes)
+                if not block:
+                    break
+                if len(block) < chunk_bytes:
+                    # 文件末尾, 最后一行可能没有换行符
+                    line_count = block.count(b'\n') + (0 if block.endswith(b'\n') else 1)
+                    end = offset + len(block)
                 else:
-                    # 可以在这里决定是跳过还是抛出异常
-                    # 为了保持与原逻辑一致，我们在处理器层处理异常
-                    raise ValueError("JSON 解析失败或为空")
+                    cut = block.rfind(b'\n')
+                    if cut == -1:
+                        # 单行超过区间大小, 向后补齐到行尾
+                        rest = f.readline()
+                        line_count = 1
+                        end = offset + len(block) + len(rest)
+                    else:
+                        line_count = block.count(b'\n', 0, cut + 1)
+                        end = offset + cut + 1
+                ranges.append((offset, end, first_line, line_count))
+                offset, first_line = end, first_line + line_count
+        index.set_total(first_line - 1)
+        index.save()
+        return ranges
+
+    def read_range(self, file_path: str, start: int, end: int, first_line: int) -> Iterator[Tuple[str, int]]:
+        """
+        读取 [start, end) 字节区间内的原始行文本 (不做解析), 行号从 first_line 开始计数。
+        """
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            line_num, position = first_line, start
+            while position < end:
+                raw = f.readline()
+                if not raw:
+                    break
+                position += len(raw)
+                yield raw.decode('utf-8'), line_num
+                line_num += 1
 
-    def get_samples(self, sample_size: int) -> List[Dict[str, Any]]:
+    def get_samples(self, sample_size: int, exact: bool = False) -> List[Dict[str, Any]]:
         """
         从第一个可用的文件中随机抽取JSON行样本。
+        默认通过随机字节偏移 seek 抽样 (seek -> 跳到下一个换行 -> 解析), I/O 只与样本数量相关, 与文件大小无关;
+        长行被抽中的概率略高, 对于推断字段结构已经足够。
+        exact=True 时按行号均匀抽样, 并借助偏移索引跳过检查点之前的内容。
         """
         if not self.files_to_process:
             return []
 
         file_to_sample = self.files_to_process[0]
-        samples = []
         try:
-            total_lines = self.get_total_items(file_to_sample)
-            if total_lines == 0:
-                return []
+            if exact:
+                return self._sample_by_line_numbers(file_to_sample, sample_size)
+            return self._sample_by_offsets(file_to_sample, sample_size)
+        except Exception as e:
+            print(f"[WARNING] 从文件 '{os.path.basename(file_to_sample)}' 随机抽样时出错: {e}")
+            return []
 
-            num_samples_to_take = min(sample_size, total_lines)
-            if num_samples_to_take == 0:
-                return []
+    def _sample_by_offsets(self, file_path: str, sample_size: int) -> List[Dict[str, Any]]:
+        file_size = os.path.getsize(file_path)
+        if file_size == 0 or sample_size <= 0:
+            return []
 
-            target_line_nums = sorted(random.sample(range(1, total_lines + 1), num_samples_to_take))
+        samples, seen_offsets = [], set()
+        with open(file_path, 'rb') as f:
+            # 小文件或抽样数量接近文件大小时, 直接顺序读取全部行再抽样
+            if file_size <= 4 * 1024 * 1024:
+                lines = [raw for raw in f if raw.strip()]
+                random.shuffle(lines)
+                candidates = iter(lines)
+            else:
+                def seek_candidates():
+                    attempts = sample_size * 3
+                    for offset in sorted(random.sample(range(file_size), min(attempts, file_size))):
+                        # 从 offset - 1 开始跳过半行, 使紧跟在换行符之后的行 (包括第一行) 也能被抽中
+                        if offset > 0:
+                            f.seek(offset - 1)
+                            f.readline()
+                        else:
+                            f.seek(0)
+                        line_start = f.tell()
+                        if line_start in seen_offsets:
+                            continue
+                        seen_offsets.add(line_start)
+                        raw = f.readline()
+                        if raw.strip():
+                            yield raw
+                    # 行数极少或行长极不均匀时随机命中不足, 从文件开头顺序补齐
+                    f.seek(0)
+                    while raw := f.readline():
+                        line_start = f.tell() - len(raw)
+                        if line_start not in seen_offsets and raw.strip():
+                            yield raw
+                candidates = seek_candidates()
 
-            current_line_num, target_index = 0, 0
-            with open(file_to_sample, 'r', encoding='utf-8') as f:
-                for line in f:
-                    current_line_num += 1
-                    if target_index >= len(target_line_nums):
+            for raw in candidates:
+                if json_data := self._safe_json_load(raw.decode('utf-8', errors='ignore'), file_path):
+                    samples.append(json_data)
+                    if len(samples) >= sample_size:
                         break
-                    if current_line_num == target_line_nums[target_index]:
-                        target_index += 1
-                        if not line.strip():
-                            continue
-                        if json_data := self._safe_json_load(line):
-                            samples.append(json_data)
-        except Exception as e:
-            print(f"[WARNING] 从文件 '{os.path.basename(file_to_sample)}' 随机抽样时出错: {e}")
+        return samples
+
+    def _sample_by_line_numbers(self, file_path: str, sample_size: int) -> List[Dict[str, Any]]:
+        total_lines = self.get_total_items(file_path)
+        num_samples_to_take = min(sample_size, total_lines)
+        if num_samples_to_take <= 0:
+            return []
 
-        return samples
\ No newline at end of file
+        target_line_nums = sorted(random.sample(range(1, total_lines + 1), num_samples_to_take))
+        index = self._get_index(file_path)
+        samples = []
+        with open(file_path, 'rb') as f:
+            line_num = 1
+            for target in target_line_nums:
+                checkpoint_line, checkpoint_offset = index.nearest(target)
+                if checkpoint_line > line_num:
+                    f.seek(checkpoint_offset)
+                    line_num = checkpoint_line
+                while line_num < target:
+                    f.readline()
+                    line_num += 1
+                raw = f.readline()
+                line_num += 1
+                if not raw.strip():
+                    continue
+                if json_data := self._safe_json_load(raw.decode('utf-8', errors='ignore'), file_path):
+                    samples.append(json_data)
+        return samples
@@ -0,0 +1,111 @@
+"""
+行解码器 LineDecoder
+在已安装时优先使用 orjson / msgspec 解析 JSON, 并根据前几行自动判断内容是 JSON 还是 Python 字面量 (repr),
+之后只使用对应的解析器, 另一种解析器仅在当前行解析失败时才按需尝试。
+"""
+import ast
+import json as std_json
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_LITERAL_ERRORS = (ValueError, SyntaxError, MemoryError, TypeError, RecursionError)
+# orjson.JSONDecodeError 继承自 ValueError, msgspec.DecodeError 则需要单独捕获
+_JSON_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+
+def _available_backends() -> Dict[str, Callable[[Union[str, bytes]], Any]]:
+    backends = {}
+    if orjson is not None:
+        backends['orjson'] = orjson.loads
+    if msgspec is not None:
+        backends['msgspec'] = msgspec.json.decode
+    backends['json'] = std_json.loads
+    return backends
+
+
+_BACKENDS = _available_backends()
+
+
+class LineDecoder:
+    """
+    按文件自动选择解析器的行解码器。
+    前 detect_lines 个非空行同时记录 JSON 与字面量两种解析的命中情况, 之后固定使用命中较多的一种 (粘性偏好);
+    当某一行用首选解析器失败时, 才会回退尝试另一种。
+    格式判断结果绑定在实例上, 需要按文件独立判断时, 每个文件使用一个新的实例 (如 JsonLineReader)。
+    """
+
+    def __init__(self, backend: str = 'auto', detect_lines: int = 8):
+        """
+        :param backend: JSON 后端, 可选 'auto' (orjson > msgspec > json), 'orjson', 'msgspec', 'json'。
+        :param detect_lines: 用于判断文件格式的行数。
+        """
+        if backend == 'auto':
+            backend = next(iter(_BACKENDS))
+        if backend not in _BACKENDS:
+            raise ValueError(f"JSON 后端 '{backend}' 不可用, 可用的后端: {list(_BACKENDS)}")
+        self.backend = backend
+        self.detect_lines = detect_lines
+        self.mode: Optional[str] = None
+        self._json_hits = 0
+        self._literal_hits = 0
+
+    def _load_json(self, text: Union[str, bytes]) -> Any:
+        try:
+            return _BACKENDS[self.backend](text)
+        except _JSON_ERRORS:
+            if self.backend == 'json':
+                raise
+            # orjson / msgspec 不接受 NaN、超过 64 位的整数等, 交由标准库再判断一次
+            return std_json.loads(text)
+
+    @staticmethod
+    def _load_literal(text: Union[str, bytes]) -> Any:
+        if isinstance(text, bytes):
+            text = text.decode('utf-8')
+        return ast.literal_eval(text.strip())
+
+    def _detect(self, text: Union[str, bytes]) -> Any:
+        try:
+            result = self._load_json(text)
+            self._json_hits += 1
+        except ValueError:
+            result = self._load_literal(text)
+            self._literal_hits += 1
+        if self._json_hits + self._literal_hits >= self.detect_lines:
+            self.mode = 'literal' if self._literal_hits > self._json_hits else 'json'
+        return result
+
+    def decode(self, text: Union[str, bytes]) -> Any:
+        """
+        解析一行内容, 两种解析器都失败时抛出 ValueError。
+        """
+        try:
+            if self.mode is None:
+                return self._detect(text)
+            if self.mode == 'json':
+                try:
+                    return self._load_json(text)
+                except ValueError:
+                    return self._load_literal(text)
+            try:
+                return self._load_literal(text)
+            except _LITERAL_ERRORS:
+                return self._load_json(text)
+        except _LITERAL_ERRORS as e:
+            raise ValueError(f"Failed to parse with both json and ast. Error: {e}") from e
+
+    def decode_or_none(self, text: Union[str, bytes]) -> Any:
+        """解析一行内容, 失败时返回 None。"""
+        try:
+            return self.decode(text)
+        except ValueError:
+            return None
@@ -0,0 +1,139 @@
+"""
+根据实测写入延迟自适应调整批量大小 AdaptiveBatchSizer(initial, min_size, max_size, target_latency)
+每次写入后记录 (行数, 耗时, 字节数), 让批量大小逐步逼近目标延迟; 遇到包过大或锁等待类错误时立即减半。
+"""
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# 需要立即减小批量的错误: 包过大 / 锁等待超时 / 死锁 / 连接因包过大被断开
+_BACKOFF_CODES = {1153, 1205, 1213, 2006}
+_BACKOFF_KEYWORDS = ('max_allowed_packet', 'lock wait timeout', 'deadlock', 'database is locked')
+
+
+def _error_code(exception: Exception) -> Optional[int]:
+    args = getattr(exception, 'args', None)
+    if args and isinstance(args[0], int):
+        return args[0]
+    code_match = re.search(r"\((\d+),", str(exception))
+    return int(code_match.group(1)) if code_match else None
+
+
+class AdaptiveBatchSizer:
+    """
+    一个线程安全的批量大小控制器。
+    每次调整幅度限制在 [0.5x, 2x] 之内, 目标值与当前值相差不足 dead_band 时保持不变;
+    行数明显少于当前批量的批次 (如文件末尾的尾批) 只计入统计, 不参与调整。
+    """
+
+    def __init__(self, initial: int = 1000, min_size: int = 100, max_size: int = 20000,
+                 target_latency: float = 0.2, max_batch_bytes: Optional[int] = None, smoothing: float = 0.3,
+                 dead_band: float = 0.1, cooldown: int = 3,
+                 stats_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        :param initial: 初始批量大小。
+        :param min_size: 批量大小下限。
+        :param max_size: 批量大小上限。
+        :param target_latency: 单批写入的目标耗时 (秒)。
+        :param max_batch_bytes: 可选, 单批数据的字节上限, 需要 record 时传入字节数才会生效。
+        :param smoothing: 单行耗时/字节数的指数平滑系数, 越大越偏向最近一次的测量。
+        :param dead_band: 目标值与当前值的相对差小于该比例时不调整, 避免来回抖动。
+        :param cooldown: 退避后, 接下来这么多个成功批次内不增大批量。
+        :param stats_callback: 每次记录后调用, 参数为 stats() 返回的字典。
+        """
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_latency = target_latency
+        self.max_batch_bytes = max_batch_bytes
+        self.smoothing = smoothing
+        self.dead_band = dead_band
+        self.cooldown = cooldown
+        self.stats_callback = stats_callback
+        self.size = self._clamp(initial)
+        self._lock = threading.Lock()
+        self._row_latency: Optional[float] = None
+        self._bytes_per_row: Optional[float] = None
+        self._cooldown_left = 0
+        self._last: Dict[str, Any] = {}
+        self.batches = 0
+        self.backoffs = 0
+
+    def _clamp(self, size: float) -> int:
+        return int(min(self.max_size, max(self.min_size, size)))
+
+    def _smooth(self, previous: Optional[float], value: float) -> float:
+        return value if previous is None else self.smoothing * value + (1 - self.smoothing) * previous
+
+    def record(self, rows: int, seconds: float, nbytes: Optional[int] = None) -> int:
+        """记录一次成功写入, 返回调整后的批量大小。"""
+        if rows <= 0:
+            return self.size
+        with self._lock:
+            previous = self.size
+            self.batches += 1
+            reason = 'hold'
+            if rows >= previous / 2:
+                self._row_latency = self._smooth(self._row_latency, max(seconds, 1e-6) / rows)
+                if nbytes:
+                    self._bytes_per_row = self._smooth(self._bytes_per_row, nbytes / rows)
+                target = self.target_latency / self._row_latency
+                if self.max_batch_bytes and self._bytes_per_row:
+                    target = min(target, self.max_batch_bytes / self._bytes_per_row)
+                if self._cooldown_left > 0:
+                    self._cooldown_left -= 1
+                    target = min(target, previous)
+                if abs(target - previous) > previous * self.dead_band:
+                    self.size = self._clamp(min(previous * 2, max(previous / 2, target)))
+                    reason = 'grow' if self.size > previous else 'shrink' if self.size < previous else 'hold'
+            self._last = {'rows': rows, 'latency': seconds, 'bytes': nbytes, 'reason': reason,
+                          'previous_size': previous}
+            stats = self._stats()
+        if self.stats_callback:
+            self.stats_callback(stats)
+        return stats['batch_size']
+
+    def record_error(self, exception: Exception) -> bool:
+        """
+        记录一次写入失败。包过大、锁等待超时、死锁等错误会让批量大小立即减半, 返回是否发生了退避。
+        """
+        code = _error_code(exception)
+        message = str(exception).lower()
+        if code not in _BACKOFF_CODES and not any(keyword in message for keyword in _BACKOFF_KEYWORDS):
+            return False
+        with self._lock:
+            previous = self.size
+            self.size = self._clamp(previous / 2)
+            self.backoffs += 1
+            self._cooldown_left = self.cooldown
+            self._last = {'rows': 0, 'latency': None, 'bytes': None, 'reason': 'backoff',
+                          'previous_size': previous, 'error': str(exception)}
+            stats = self._stats()
+        if self.stats_callback:
+            self.stats_callback(stats)
+        return True
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            'batch_size': self.size,
+            'row_latency': self._row_latency,
+            'bytes_per_row': self._bytes_per_row,
+            'batches': self.batches,
+            'backoffs': self.backoffs,
+            **self._last,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """返回当前批量大小以及最近一次调整的统计信息。"""
+        with self._lock:
+            return self._stats()
+
+
+def estimate_rows_bytes(rows, samples: int = 8) -> int:
+    """按均匀抽取的少量行估算一批数据 (字典或元组) 的字节数 (各字段值的字符串长度之和)。"""
+    if not rows:
+        return 0
+    step = max(1, len(rows) // samples)
+    sampled = rows[::step][:samples]
+    sampled_bytes = sum(len(str(value)) for row in sampled
+                        for value in (row.values() if isinstance(row, dict) else row) if value is not None)
+    return sampled_bytes * len(rows) // len(sampled)
@@ -4,21 +4,83 @@
 """
 import os
 import re
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 
-def _count_file_lines(file_path: str) -> Optional[int]:
+# 每次读取的块大小, 以二进制方式读取并直接统计换行符, 不做解码
+_CHUNK_SIZE = 8 * 1024 * 1024
+# 用于识别二进制文件的嗅探长度
+_SNIFF_SIZE = 8192
+
+# 行数缓存: 绝对路径 -> (文件大小, 修改时间ns, 行数), 文件未变化时重复统计不再读取文件
+_line_count_cache: Dict[str, Tuple[int, int, int]] = {}
+_cache_lock = threading.Lock()
+
+
+def _count_newlines(file_path: str) -> int:
+    """
+    以二进制分块读取并统计换行符数量。
+    与按文本行迭代的结果一致: 文件末尾没有换行符时, 最后一行同样计数。
+    """
+    count = 0
+    last_byte = b'\n'
+    with open(file_path, 'rb', buffering=0) as f:
+        # 小文件只分配与文件大小相当的缓冲区
+        buffer_size = max(1, min(_CHUNK_SIZE, os.fstat(f.fileno()).st_size))
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
+        while n := f.readinto(buffer):
+            chunk = buffer if n == buffer_size else view[:n].tobytes()
+            count += chunk.count(b'\n')
+            last_byte = chunk[n - 1:n]
+    if last_byte != b'\n':
+        count += 1
+    return count
+
+
+def _is_binary_file(file_path: str) -> bool:
+    """文件开头包含 NUL 字节时视为二进制文件。"""
+    with open(file_path, 'rb') as f:
+        return b'\0' in f.read(_SNIFF_SIZE)
+
+
+def _count_file_lines(file_path: str, use_cache: bool = True) -> Optional[int]:
     """
     一个内部辅助函数，用于统计单个文件的行数。
     如果文件无法读取，返回 None。
+    use_cache 为 True 时, 以 (大小, 修改时间) 为键缓存结果。
     """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return sum(1 for _ in f)
+        if not use_cache:
+            return _count_newlines(file_path)
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with _cache_lock:
+            cached = _line_count_cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        line_count = _count_newlines(file_path)
+        with _cache_lock:
+            _line_count_cache[key] = (stat.st_size, stat.st_mtime_ns, line_count)
+        return line_count
     except Exception as e:
         print(f"警告：无法读取文件 '{os.path.basename(file_path)}' - {e}")
         return None
 
-def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', pattern: str = ''):
+
+def clear_line_count_cache():
+    """清空行数缓存。"""
+    with _cache_lock:
+        _line_count_cache.clear()
+
+
+def _default_workers() -> int:
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', pattern: str = '',
+                         workers: Optional[int] = None, use_cache: bool = True):
     """
     统计指定文件夹内符合条件的所有文件的行数。
 
@@ -27,6 +89,8 @@ def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', p
         prefix (str): 可选。只统计文件名以该前缀开始的文件。
         suffix (str): 可选。只统计文件名以该后缀结尾的文件。
         pattern (str): 可选。只统计文件名符合该正则表达式的文件。
+        workers (int): 可选。并发统计的线程数, 默认按 CPU 数量决定。
+        use_cache (bool): 可选。是否使用 (大小, 修改时间) 行数缓存。
     """
     if not os.path.isdir(folder_path):
         print(f"错误：'{folder_path}' 不是一个有效的文件夹路径。")
@@ -46,6 +110,7 @@ def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', p
     else:
         regex = None
 
+    filenames = []
     for filename in os.listdir(folder_path):
         # 构建完整的文件路径
         filepath = os.path.join(folder_path, filename)
@@ -61,12 +126,17 @@ def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', p
             continue
         if regex and not regex.search(filename):
             continue
-
-        line_count = _count_file_lines(filepath)
-        if line_count is not None:
-            file_count += 1
-            total_lines += line_count
-            print(f"文件：'{filename}'，行数：{line_count}")
+        filenames.append(filename)
+
+    # 多个文件并发统计, 输出顺序与目录顺序保持一致
+    with ThreadPoolExecutor(max_workers=workers or _default_workers()) as executor:
+        line_counts = executor.map(
+            lambda name: _count_file_lines(os.path.join(folder_path, name), use_cache), filenames)
+        for filename, line_count in zip(filenames, line_counts):
+            if line_count is not None:
+                file_count += 1
+                total_lines += line_count
+                print(f"文件：'{filename}'，行数：{line_count}")
 
     if file_count == 0:
         print("该文件夹中没有找到任何符合条件的文件。")
@@ -75,18 +145,19 @@ def count_lines_in_files(folder_path: str, prefix: str = '', suffix: str = '', p
         return total_lines
 
 
-def count_lines_in_single_file(file_path: str):
+def count_lines_in_single_file(file_path: str, use_cache: bool = True):
     """
     统计指定文件的行数，并输出文件名和对应的行数。
 
     Args:
         file_path (str): 目标文件的路径。
+        use_cache (bool): 可选。是否使用 (大小, 修改时间) 行数缓存。
     """
     if not os.path.isfile(file_path):
         print(f"错误：'{file_path}' 不是一个有效的文件路径。")
         return None
 
-    line_count = _count_file_lines(file_path)
+    line_count = _count_file_lines(file_path, use_cache)
     if line_count is not None:
         filename = os.path.basename(file_path)
         print(f"文件：'{filename}' 的总行数为：{line_count}")
@@ -96,7 +167,8 @@ def count_lines_in_single_file(file_path: str):
 
 
 
-def count_lines_in_directory(path, ignore_dirs=None, ignore_exts=None):
+def count_lines_in_directory(path, ignore_dirs=None, ignore_exts=None, workers: Optional[int] = None,
+                             use_cache: bool = True):
     """
     递归统计指定文件夹下所有文件的总行数。
 
@@ -104,9 +176,11 @@ def count_lines_in_directory(path, ignore_dirs=None, ignore_exts=None):
         path (str): 要统计的目录路径。
         ignore_dirs (list): 需要忽略的目录名称列表。
         ignore_exts (list): 需要忽略的文件扩展名列表。
+        workers (int): 可选。并发统计的线程数, 默认按 CPU 数量决定。
+        use_cache (bool): 可选。是否使用 (大小, 修改时间) 行数缓存。
 
     Returns:
-        int: 总行数。
+        tuple: (总行数, 文件数)。
     """
     if ignore_dirs is None:
         ignore_dirs = ['.git', '__pycache__', '.idea', 'venv', 'node_modules']
@@ -118,6 +192,7 @@ def count_lines_in_directory(path, ignore_dirs=None, ignore_exts=None):
 
     print(f"开始统计目录: {path}")
 
+    file_paths = []
     for root, dirs, files in os.walk(path):
         # 移除需要忽略的目录
         dirs[:] = [d for d in dirs if d not in ignore_dirs]
@@ -126,19 +201,24 @@ def count_lines_in_directory(path, ignore_dirs=None, ignore_exts=None):
             # 跳过需要忽略的文件扩展名
             if any(file_name.endswith(ext) for ext in ignore_exts):
                 continue
+            file_paths.append(os.path.join(root, file_name))
 
-            file_path = os.path.join(root, file_name)
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    total_lines += len(lines)
-                    file_count += 1
-            except UnicodeDecodeError:
-                # 忽略无法用 UTF-8 解码的二进制文件
-                print(f"已跳过二进制文件或编码错误的文件: {file_path}")
-            except Exception as e:
-                print(f"处理文件 {file_path} 时发生错误: {e}")
+    def count_one(file_path):
+        try:
+            if _is_binary_file(file_path):
+                # 忽略二进制文件
+                print(f"已跳过二进制文件: {file_path}")
+                return None
+        except Exception as e:
+            print(f"处理文件 {file_path} 时发生错误: {e}")
+            return None
+        return _count_file_lines(file_path, use_cache)
+
+    with ThreadPoolExecutor(max_workers=workers or _default_workers()) as executor:
+        for line_count in executor.map(count_one, file_paths):
+            if line_count is not None:
+                total_lines += line_count
+                file_count += 1
 
     return total_lines, file_count
 
@@ -0,0 +1,102 @@
+"""
+节流的单行进度条 ProgressReporter(total)
+每秒最多渲染若干次 (或每 K 个条目渲染一次), 并显示速率与预计剩余时间。
+"""
+import sys
+import time
+from typing import Optional, TextIO
+
+
+def _console_stream() -> TextIO:
+    """
+    返回真正的控制台流。
+    当 Logger 接管了 sys.stdout 时, 直接写入其保存的原始流, 使 \\r 刷新不会进入日志文件。
+    """
+    return getattr(sys.stdout, '_original_stdout', None) or sys.stdout
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressReporter:
+    """
+    一个节流的单行进度条。
+    update() 可以在每一行/每一批调用, 实际渲染频率受 min_interval (秒) 和 every (条目数) 控制。
+    """
+
+    def __init__(self, total: int = 0, min_interval: float = 0.2, every: int = 0, width: int = 40,
+                 stream: Optional[TextIO] = None):
+        """
+        :param total: 总量, 为 0 时只显示当前计数和速率。
+        :param min_interval: 两次渲染之间的最小间隔 (秒)。
+        :param every: 大于 0 时, 每前进 every 个条目也会触发一次渲染。
+        :param width: 进度条宽度。
+        :param stream: 输出流, 默认为控制台。
+        """
+        self.total = total
+        self.min_interval = min_interval
+        self.every = every
+        self.width = width
+        self._stream = stream
+        self._start_time = time.monotonic()
+        self._start_value: Optional[int] = None
+        self._last_render_time = 0.0
+        self._last_render_value = 0
+        self._last_length = 0
+        self._last_suffix: Optional[str] = None
+        self.current = 0
+
+    def update(self, current: int, suffix: str = '', force: bool = False):
+        """记录当前进度, 满足节流条件时才真正渲染。"""
+        self.current = current
+        if self._start_value is None:
+            self._start_value = current
+        now = time.monotonic()
+        if not (force
+                or now - self._last_render_time >= self.min_interval
+                or (self.every and current - self._last_render_value >= self.every)
+                or (self.total and current >= self.total)):
+            return
+        self._render(now, suffix)
+
+    def close(self, suffix: str = ''):
+        """渲染最终状态并换行; 上一次渲染已经显示了最终状态时不再重复渲染。"""
+        already_rendered = (self._last_suffix is not None and self._last_render_value == self.current
+                            and (not suffix or suffix == self._last_suffix))
+        if not already_rendered:
+            self._render(time.monotonic(), suffix)
+        stream = self._stream or _console_stream()
+        stream.write('\n')
+        stream.flush()
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self._start_time
+        done = self.current - (self._start_value or 0)
+        return done / elapsed if elapsed > 0 else 0.0
+
+    def _render(self, now: float, suffix: str):
+        self._last_render_time = now
+        self._last_render_value = self.current
+        self._last_suffix = suffix
+        rate = self.rate
+        if self.total > 0:
+            ratio = min(1.0, self.current / self.total)
+            filled = int(self.width * ratio)
+            eta = _format_duration((self.total - self.current) / rate) if rate > 0 and self.current < self.total else '--:--:--'
+            text = (f"\r|{'█' * filled}{'-' * (self.width - filled)}| {ratio:.1%} ({self.current}/{self.total})"
+                    f"  {rate:,.0f}/s  ETA {eta}")
+        else:
+            text = f"\r{self.current}  {rate:,.0f}/s"
+        if suffix:
+            text += f"  {suffix}"
+        # 用空格覆盖上一次渲染残留的字符
+        padding = ' ' * max(0, self._last_length - len(text))
+        self._last_length = len(text)
+        stream = self._stream or _console_stream()
+        stream.write(text + padding)
+        stream.flush()
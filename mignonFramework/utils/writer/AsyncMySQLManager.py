@@ -0,0 +1,166 @@
+"""
+异步 MySQL 写入器 AsyncMySQLManager
+基于 aiomysql (未安装时尝试 asyncmy) 的连接池, upsert_batch / upsert_single 为协程;
+配合 GenericFileProcessor.run_async 使用时, 文件读取/转换与多个批次的写入在同一个事件循环中重叠进行, 不需要额外的线程。
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from mignonFramework.utils.writer.BaseWriter import BaseWriter
+from mignonFramework.utils.writer.ErrorIsolation import is_connection_error
+from mignonFramework.utils.writer.MySQLManager import _row_values, _upsert_statement
+
+try:
+    import aiomysql as _driver
+    _DRIVER_NAME = 'aiomysql'
+except ImportError:
+    try:
+        import asyncmy as _driver
+        _DRIVER_NAME = 'asyncmy'
+    except ImportError:
+        _driver = None
+        _DRIVER_NAME = None
+
+
+class AsyncMySQLManager(BaseWriter):
+    """
+    一个异步的 BaseWriter 实现, SQL 语义与 MysqlManager 相同 (INSERT ... ON DUPLICATE KEY UPDATE)。
+    连接池在第一次写入时于当前事件循环中创建, 同一时刻最多 max_in_flight 个批次在写入;
+    连接类错误时丢弃该连接并换一个连接重试一次, 其余错误直接抛出, 由调用方进入二分定位恢复模式。
+
+    注意: upsert_batch / upsert_single 返回协程, 只能在 GenericFileProcessor.run_async 或自己的异步代码中使用。
+    """
+
+    def __init__(self, host: str, user: str, password: str, database: str, port: int = 3306,
+                 pool_size: int = 5, max_in_flight: Optional[int] = None, pool_recycle: int = 3600,
+                 connect_options: Optional[Dict[str, Any]] = None):
+        """
+        :param pool_size: 连接池中连接数的上限。
+        :param max_in_flight: 同时写入的批次数上限, 默认等于 pool_size。
+        :param pool_recycle: 连接使用超过该秒数后被回收重建, 避免被服务端 wait_timeout 断开。
+        :param connect_options: 额外传给驱动 create_pool 的参数。
+        """
+        if _driver is None:
+            raise ImportError("AsyncMySQLManager 需要安装 aiomysql 或 asyncmy: pip install aiomysql")
+        self.db_config = {
+            'host': host, 'user': user, 'password': password, 'port': port,
+            'charset': 'utf8mb4', 'autocommit': False, 'connect_timeout': 10,
+            # aiomysql 使用 db, asyncmy 使用 database
+            ('db' if _DRIVER_NAME == 'aiomysql' else 'database'): database,
+        }
+        if connect_options:
+            self.db_config.update(connect_options)
+        self.pool_size = max(1, pool_size)
+        self.max_in_flight = max(1, min(max_in_flight or self.pool_size, self.pool_size))
+        self.pool_recycle = pool_recycle
+        self._pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+
+    async def _get_pool(self):
+        if self._pool is not None:
+            return self._pool
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self._pool is None:
+                try:
+                    self._pool = await _driver.create_pool(minsize=1, maxsize=self.pool_size,
+                                                           pool_recycle=self.pool_recycle, **self.db_config)
+                    self._in_flight = asyncio.Semaphore(self.max_in_flight)
+                    print(f"[AsyncMySQLManager] 数据库连接池已创建 ({_DRIVER_NAME}, 连接数上限 {self.pool_size})。")
+                except Exception as e:
+                    print(f"[AsyncMySQLManager] 数据库连接失败: {e}")
+                    raise
+        return self._pool
+
+    @staticmethod
+    async def _rollback_quietly(conn):
+        try:
+            await conn.rollback()
+        except Exception:
+            pass
+
+    async def _run_pooled(self, operation: Callable[[Any], Awaitable[Any]]) -> Any:
+        """
+        借出一个连接执行 operation(conn)。
+        连接类错误时关闭该连接 (连接池会将其丢弃), 换一个连接再执行一次。
+        """
+        pool = await self._get_pool()
+        # 重试同样在 _in_flight 之内进行, 连接故障期间同时写入的批次数也不会超过 max_in_flight
+        async with self._in_flight:
+            for attempt in range(2):
+                try:
+                    async with pool.acquire() as conn:
+                        try:
+                            return await operation(conn)
+                        except Exception as e:
+                            if is_connection_error(e):
+                                conn.close()
+                            raise
+                except Exception as e:
+                    if attempt or not is_connection_error(e):
+                        raise
+                    print(f"[AsyncMySQLManager] 连接已丢失或操作期间连接断开: {e}。将再次尝试重连并执行操作。")
+
+    async def upsert_batch(self, data_list: List[Dict[str, Any]], table_name: str, test: bool = False) -> bool:
+        """将数据字典列表批量插入或更新到数据库中 (Upsert), 测试模式下回滚。"""
+        if not data_list:
+            return True
+
+        columns = tuple(data_list[0])
+        sql, getter = _upsert_statement(table_name, columns)
+        values = _row_values(getter, columns, data_list)
+
+        async def operation(conn):
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.executemany(sql, values)
+                if not test:
+                    await conn.commit()
+                else:
+                    await conn.rollback()
+                return True
+            except Exception:
+                await self._rollback_quietly(conn)
+                raise
+
+        return await self._run_pooled(operation)
+
+    async def upsert_single(self, data_dict: Dict[str, Any], table_name: str, test: bool = False) -> bool:
+        """将单个数据字典插入或更新到数据库中。"""
+        if not data_dict:
+            return True
+
+        columns = tuple(data_dict)
+        sql, getter = _upsert_statement(table_name, columns)
+        values = getter(data_dict)
+
+        async def operation(conn):
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(sql, values)
+                if not test:
+                    await conn.commit()
+                else:
+                    await conn.rollback()
+                return True
+            except Exception:
+                await self._rollback_quietly(conn)
+                raise
+
+        return await self._run_pooled(operation)
+
+    async def close(self):
+        """关闭连接池并等待所有连接断开。"""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            pool.close()
+            await pool.wait_closed()
+            print("[AsyncMySQLManager] 数据库连接池已关闭。")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
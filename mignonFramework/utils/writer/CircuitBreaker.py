@@ -0,0 +1,127 @@
+"""
+连接熔断器 CircuitBreaker 与带抖动的指数退避 backoff_delay
+连续 failure_threshold 次连接失败后熔断 (open), reset_timeout 秒内直接拒绝新的连接尝试;
+到期后进入半开 (half_open) 状态, 只放行一次探测连接, 成功则恢复 (closed), 失败则重新熔断。
+call_when_available 在熔断期间于调用方暂停等待, 累计等待超过上限后抛出 ConnectionError。
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# call_when_available 默认最多暂停等待的总秒数
+DEFAULT_MAX_WAIT = 600.0
+
+
+class CircuitOpenError(ConnectionError):
+    """熔断期间拒绝连接尝试时抛出, retry_after 为距离允许下一次探测的秒数。"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    第 attempt 次 (从 0 开始) 重试前的等待秒数。
+    上限为 min(cap, base * 2 ** attempt), 实际等待取上限的一半再加上同等范围内的随机抖动, 避免多个连接同时重试。
+    """
+    ceiling = min(cap, base * (2 ** min(attempt, 32)))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class CircuitBreaker:
+    """一个线程安全的连接熔断器, 通过 state / retry_after() 查询当前状态。"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        :param failure_threshold: 连续连接失败多少次后熔断。
+        :param reset_timeout: 熔断持续的秒数, 到期后放行一次探测。
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def retry_after(self) -> float:
+        """距离允许下一次连接尝试的秒数, 未熔断时为 0。"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def before_attempt(self):
+        """发起连接前调用: 熔断中, 或半开状态下已有其他线程在探测时, 抛出 CircuitOpenError。"""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_after = max(0.0, self._opened_at + self.reset_timeout - time.monotonic()) if state == OPEN \
+                else min(1.0, self.reset_timeout)
+        raise CircuitOpenError(f"连接已熔断, {retry_after:.1f} 秒后允许重试。", retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """记录一次连接失败, 达到阈值或半开探测失败时 (重新) 熔断。"""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+def call_when_available(writer: Any, operation: Callable[[], Any], max_wait: Optional[float] = None) -> Any:
+    """
+    执行 operation(); writer 处于熔断状态时先在调用方暂停等待, operation 因熔断被拒绝时等待后重试。
+    writer 没有 is_available 方法 (不支持熔断) 时直接执行。
+    累计暂停超过 max_wait 秒 (默认取 writer.circuit_max_wait) 时抛出 ConnectionError, 不会无限等待。
+    """
+    is_available = getattr(writer, 'is_available', None)
+    if is_available is None:
+        return operation()
+    if max_wait is None:
+        max_wait = getattr(writer, 'circuit_max_wait', DEFAULT_MAX_WAIT)
+    deadline = time.monotonic() + max_wait
+
+    def pause(delay: float, reason: str):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ConnectionError(f"写入器已连续 {max_wait:.0f} 秒不可用 (数据库连接熔断), 放弃重试: {reason}")
+        delay = min(delay, remaining)
+        print(f"\n[WARNING] 写入器暂时不可用: {reason} 暂停 {delay:.1f} 秒后重试...")
+        time.sleep(delay)
+
+    while True:
+        if not is_available():
+            pause(max(0.5, writer.retry_after()), "数据库连接已熔断。")
+            continue
+        try:
+            return operation()
+        except CircuitOpenError as e:
+            pause(max(0.5, e.retry_after), str(e))
@@ -0,0 +1,138 @@
+"""
+批量写入失败时的二分定位 bisect_write(items, write_batch, write_single, ...)
+将失败的批次对半拆分为子批次重试, 直到定位出具体的错误行;
+k 个错误行只需要约 O(k log n) 次写入, 而不是逐行重发整个批次的 n 次。
+"""
+from typing import Any, Awaitable, Callable, Generator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# on_row_error 的返回值: 跳过当前行 / 跳过本批次中剩余的所有行
+SKIP = 'skip'
+SKIP_REST = 'skip_rest'
+
+# 连接类错误码: 出现时拆分重试没有意义, 直接抛出
+# 2002/2003 无法连接, 2006 server has gone away, 2013/2055 查询中连接丢失, 4031 因空闲被服务端断开
+_CONNECTION_ERROR_CODES = {2002, 2003, 2006, 2013, 2055, 4031}
+
+
+def is_connection_error(exception: Exception) -> bool:
+    """判断异常是否为数据库连接类错误 (连接失败、连接断开、重连失败或连接熔断等)。"""
+    if isinstance(exception, ConnectionError):
+        return True
+    args = getattr(exception, 'args', None)
+    return bool(args) and isinstance(args[0], int) and args[0] in _CONNECTION_ERROR_CODES
+
+
+class _SkipRest(Exception):
+    pass
+
+
+# _bisect_steps 产出的写入请求类型
+_BATCH = 'batch'
+_SINGLE = 'single'
+
+
+def _bisect_steps(items: Sequence[T],
+                  on_success: Optional[Callable[[List[T]], None]],
+                  on_row_error: Optional[Callable[[T, Exception], str]],
+                  is_fatal: Callable[[Exception], bool]) -> Generator[Tuple[str, Any], Optional[Exception], int]:
+    """
+    二分定位的拆分与决策逻辑, 由同步/异步两个入口共用。
+    依次产出写入请求 (_BATCH, 子批次) 或 (_SINGLE, 单条记录), 调用方执行写入后 send() 回本次写入的异常 (成功为 None);
+    生成器结束时返回执行的写入次数。
+    """
+    attempts = 0
+
+    def single(item: T):
+        nonlocal attempts
+        attempts += 1
+        error = yield _SINGLE, item
+        if error is None:
+            if on_success:
+                on_success([item])
+            return
+        if on_row_error is None:
+            raise error
+        if on_row_error(item, error) == SKIP_REST:
+            raise _SkipRest()
+
+    def split(chunk: List[T]):
+        nonlocal attempts
+        if len(chunk) == 1:
+            yield from single(chunk[0])
+            return
+        middle = len(chunk) // 2
+        for half in (chunk[:middle], chunk[middle:]):
+            if len(half) == 1:
+                yield from single(half[0])
+                continue
+            attempts += 1
+            error = yield _BATCH, half
+            if error is None:
+                if on_success:
+                    on_success(half)
+                continue
+            if is_fatal(error):
+                raise error
+            yield from split(half)
+
+    try:
+        yield from split(list(items))
+    except _SkipRest:
+        pass
+    return attempts
+
+
+def bisect_write(items: Sequence[T],
+                 write_batch: Callable[[List[T]], Any],
+                 write_single: Callable[[T], Any],
+                 on_success: Optional[Callable[[List[T]], None]] = None,
+                 on_row_error: Optional[Callable[[T, Exception], str]] = None,
+                 is_fatal: Callable[[Exception], bool] = is_connection_error) -> int:
+    """
+    对一个已经整体写入失败的批次做二分定位恢复, 子批次按原顺序依次处理。
+
+    :param items: 写入失败的批次。
+    :param write_batch: 写入一个子批次, 失败时抛出异常。
+    :param write_single: 写入单条记录, 失败时抛出异常 (定位到单行时使用)。
+    :param on_success: 每个写入成功的子批次 (或单行) 的回调, 调用顺序与原批次顺序一致。
+    :param on_row_error: 定位到错误行时调用, 返回 SKIP 或 SKIP_REST, 需要终止时直接抛出异常; 为 None 时直接抛出该行的异常。
+    :param is_fatal: 子批次失败时判断是否为无需继续拆分的致命错误 (如连接断开), 是则直接抛出。
+    :return: 恢复过程中执行的写入次数。
+    """
+    steps = _bisect_steps(items, on_success, on_row_error, is_fatal)
+    error = None
+    while True:
+        try:
+            kind, payload = steps.send(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            (write_batch if kind == _BATCH else write_single)(payload)
+            error = None
+        except Exception as e:
+            error = e
+
+
+async def bisect_write_async(items: Sequence[T],
+                             write_batch: Callable[[List[T]], Awaitable[Any]],
+                             write_single: Callable[[T], Awaitable[Any]],
+                             on_success: Optional[Callable[[List[T]], None]] = None,
+                             on_row_error: Optional[Callable[[T, Exception], str]] = None,
+                             is_fatal: Callable[[Exception], bool] = is_connection_error) -> int:
+    """
+    bisect_write 的异步版本, write_batch / write_single 为协程函数, 其余参数与返回值相同。
+    """
+    steps = _bisect_steps(items, on_success, on_row_error, is_fatal)
+    error = None
+    while True:
+        try:
+            kind, payload = steps.send(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            await (write_batch if kind == _BATCH else write_single)(payload)
+            error = None
+        except Exception as e:
+            error = e
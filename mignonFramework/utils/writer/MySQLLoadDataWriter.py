@@ -0,0 +1,148 @@
+"""
+基于 LOAD DATA LOCAL INFILE 的 MySQL 批量写入器 MySQLLoadDataWriter
+适用于向空表 (或以覆盖/忽略为主的表) 做首次大批量导入, 每批数据先写入临时 TSV 文件再交给 MySQL 原生加载器。
+"""
+import math
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+import pymysql
+
+from mignonFramework.utils.writer.MySQLManager import MysqlManager
+
+# TSV 字段中需要转义的字符 (对应 FIELDS ESCAPED BY '\\')
+_TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+# 服务端或客户端禁止 LOCAL INFILE 时的错误码
+_LOCAL_INFILE_DISABLED_CODES = {1148, 2068, 3948}
+# IGNORE 模式下主键/唯一键冲突产生的警告 (Duplicate entry), 属于预期行为
+_DUPLICATE_ENTRY_CODE = 1062
+
+
+class _UnsupportedValue(Exception):
+    """批次中存在无法安全写入文本 TSV 的值 (如 bytes)。"""
+    pass
+
+
+def _tsv_field(value: Any) -> str:
+    if value is None:
+        return '\\N'
+    value_type = type(value)
+    if value_type is str:
+        return value.translate(_TSV_ESCAPES)
+    if value_type is bool:
+        return '1' if value else '0'
+    if value_type is int or value_type is Decimal:
+        return str(value)
+    if value_type is float:
+        if not math.isfinite(value):
+            raise _UnsupportedValue(value)
+        return repr(value)
+    if value_type is datetime and value.tzinfo is None:
+        return value.isoformat(' ')
+    if value_type is date:
+        return value.isoformat()
+    if isinstance(value, str):
+        return str(value).translate(_TSV_ESCAPES)
+    raise _UnsupportedValue(value)
+
+
+class MySQLLoadDataWriter(MysqlManager):
+    """
+    一个使用 LOAD DATA LOCAL INFILE 写入的 BaseWriter 实现, 可直接用于 GenericFileProcessor(writer=...)。
+    upsert_batch / upsert_tuples 把整批数据写入临时 TSV 文件后以 REPLACE 或 IGNORE 方式加载;
+    加载失败时抛出异常, 由调用方 (如 GenericFileProcessor) 进入二分定位恢复模式, 定位到单行时沿用 MysqlManager.upsert_single。
+
+    注意: REPLACE 会先删除再插入冲突的整行, 未包含在数据中的列会被重置为默认值 (包括 create_time);
+    需要 ON DUPLICATE KEY UPDATE 语义时请使用 MysqlManager。服务端需开启 local_infile。
+    LOAD DATA LOCAL 会把数据解释错误 (超长字符串被截断、非法的整数/日期等) 降级为警告, 因此加载后若存在这类警告,
+    本批会回滚并抛出 pymysql.err.DataError, 使调用方二分定位出具体的错误行, 而不是静默写入被截断/转换后的值。
+    """
+
+    def __init__(self, host: str, user: str, password: str, database: str, port: int = 3306,
+                 mode: str = 'replace', temp_dir: Optional[str] = None, **kwargs):
+        """
+        :param mode: 主键/唯一键冲突时的处理方式, 'replace' (覆盖) 或 'ignore' (保留已有行)。
+        :param temp_dir: 临时 TSV 文件的存放目录, 默认为系统临时目录。
+        :param kwargs: 其余参数透传给 MysqlManager。
+        """
+        if mode not in ('replace', 'ignore'):
+            raise ValueError("mode 只能是 'replace' 或 'ignore'。")
+        self.mode = mode
+        self.temp_dir = temp_dir
+        self._load_data_disabled = False
+        connect_options = dict(kwargs.pop('connect_options', None) or {})
+        connect_options['local_infile'] = True
+        super().__init__(host, user, password, database, port, connect_options=connect_options, **kwargs)
+
+    def upsert_tuples(self, table_name: str, columns: Sequence[str], rows: Sequence[tuple],
+                      test: bool = False) -> bool:
+        """
+        将整批数据通过 LOAD DATA LOCAL INFILE 写入 (upsert_batch 同样经由此方法)。
+        服务端禁止 LOCAL INFILE 或批次中含有无法写入 TSV 的值时, 回退到 MysqlManager 的常规批量写入。
+        """
+        if not rows:
+            return True
+        if self._load_data_disabled:
+            return super().upsert_tuples(table_name, columns, rows, test)
+
+        columns = tuple(columns)
+        fd, tsv_path = tempfile.mkstemp(prefix='mignon_load_', suffix='.tsv', dir=self.temp_dir)
+        try:
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                    f.writelines('\t'.join(map(_tsv_field, row)) + '\n' for row in rows)
+            except _UnsupportedValue as e:
+                print(f"[MySQLLoadDataWriter] 批次中存在无法写入 TSV 的值 ({type(e.args[0]).__name__}), 本批改用常规批量写入。")
+                return super().upsert_tuples(table_name, columns, rows, test)
+            return self._load_file(tsv_path, table_name, columns, test)
+        except pymysql.MySQLError as e:
+            if e.args and e.args[0] in _LOCAL_INFILE_DISABLED_CODES:
+                print(f"[MySQLLoadDataWriter] LOAD DATA LOCAL INFILE 不可用 ({e}), 之后的批次将改用常规批量写入。")
+                self._load_data_disabled = True
+                return super().upsert_tuples(table_name, columns, rows, test)
+            raise
+        finally:
+            try:
+                os.remove(tsv_path)
+            except OSError:
+                pass
+
+    def _load_file(self, tsv_path: str, table_name: str, columns: tuple, test: bool) -> bool:
+        column_sql = ', '.join(f'`{col}`' for col in columns)
+
+        def operation(conn):
+            sql = (f"LOAD DATA LOCAL INFILE {conn.escape(tsv_path)} {self.mode.upper()} INTO TABLE `{table_name}` "
+                   r"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+                   f"({column_sql})")
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql)
+                    warnings = self._data_warnings(cursor) if getattr(cursor, 'warning_count', 1) else []
+                if warnings:
+                    level, code, message = warnings[0]
+                    raise pymysql.err.DataError(
+                        code, f"LOAD DATA 产生 {len(warnings)} 条数据警告, 本批已回滚 (首条: {level} {code} {message})")
+                if not test:
+                    conn.commit()
+                else:
+                    conn.rollback()
+                return True
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                raise e
+
+        return self._run_pooled(operation)
+
+    def _data_warnings(self, cursor) -> list:
+        """读取 SHOW WARNINGS, 返回 (Level, Code, Message) 列表; IGNORE 模式下忽略主键冲突警告。"""
+        cursor.execute("SHOW WARNINGS")
+        warnings = []
+        for row in cursor.fetchall():
+            level, code, message = (row['Level'], row['Code'], row['Message']) if isinstance(row, dict) else row[:3]
+            if self.mode == 'ignore' and code == _DUPLICATE_ENTRY_CODE:
+                continue
+            warnings.append((level, code, message))
+        return warnings
@@ -1,31 +1,212 @@
 import pymysql
 import pymysql.cursors
+from pymysql.constants import SERVER_STATUS
+from pymysql.converters import escape_string
 import time
 import functools
-from typing import List, Dict, Any, Optional
+import math
+import operator
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, List, Dict, Any, Iterator, Optional, Sequence, Tuple
 
 from mignonFramework.utils.writer.BaseWriter import BaseWriter
+from mignonFramework.utils.writer.CircuitBreaker import CLOSED, OPEN, CircuitBreaker, CircuitOpenError, backoff_delay
+from mignonFramework.utils.writer.ErrorIsolation import is_connection_error
 
 
-# --- 新增的装饰器，用于实现自动重连 ---
-def ensure_connection(func):
+def _is_connection_failure(exception: Exception) -> bool:
+    """连接已不可用的错误 (连接断开/无法连接, 或连接已被关闭); 锁等待超时、LOAD DATA 被拒绝等其余 OperationalError 不算。"""
+    return isinstance(exception, pymysql.err.InterfaceError) or is_connection_error(exception)
+
+
+@functools.lru_cache(maxsize=256)
+def _upsert_statement(table_name: str, columns: Tuple[str, ...]) -> Tuple[str, Callable[[Dict[str, Any]], tuple]]:
+    """
+    按 (表名, 列元组) 缓存 UPSERT 语句以及对应的取值函数。
+    取值函数为预先构建的 operator.itemgetter, 单列时同样返回元组。
+    """
+    update_columns = [col for col in columns if col.lower() not in ['id', 'create_time']]
+    sql = f"""
+            INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            ON DUPLICATE KEY UPDATE {', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)}
+        """
+    if len(columns) == 1:
+        single_getter = operator.itemgetter(columns[0])
+        return sql, lambda data: (single_getter(data),)
+    return sql, operator.itemgetter(*columns)
+
+
+@functools.lru_cache(maxsize=256)
+def _bulk_statement_parts(table_name: str, columns: Tuple[str, ...]) -> Tuple[str, str]:
+    """按 (表名, 列元组) 缓存多行 VALUES 语句的前缀 (INSERT ... VALUES) 与后缀 (ON DUPLICATE KEY UPDATE ...)。"""
+    update_columns = [col for col in columns if col.lower() not in ['id', 'create_time']]
+    prefix = f"INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)}) VALUES "
+    suffix = f" ON DUPLICATE KEY UPDATE {', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)}"
+    return prefix, suffix
+
+
+def _make_literal(conn: pymysql.connections.Connection) -> Callable[[Any], str]:
     """
-    一个装饰器，确保在执行数据库操作前连接是有效的。
-    如果连接断开，它将根据预设的策略尝试重新连接。
-    此版本仅处理真正的连接错误，数据相关错误将由调用者处理。
+    返回一个把 Python 值转换为 SQL 字面量的函数。
+    None / str / int / float / datetime / date 走快速分支, 其余类型 (bytes, Decimal, 带时区的时间等) 交给 conn.escape。
+    字符串转义方式按连接当前的 NO_BACKSLASH_ESCAPES 状态确定一次, 与 conn.escape 的结果一致。
     """
+    escape = conn.escape
+    if getattr(conn, 'server_status', 0) & SERVER_STATUS.SERVER_STATUS_NO_BACKSLASH_ESCAPES:
+        def quote(text: str) -> str:
+            return "'" + text.replace("'", "''") + "'"
+    else:
+        def quote(text: str) -> str:
+            return "'" + escape_string(text) + "'"
+
+    def literal(value: Any) -> str:
+        if value is None:
+            return 'NULL'
+        value_type = type(value)
+        if value_type is str:
+            return quote(value)
+        if value_type is int:
+            return str(value)
+        if value_type is float and math.isfinite(value):
+            text = repr(value)
+            return text if 'e' in text else text + 'e0'
+        if value_type is datetime and value.tzinfo is None:
+            return "'" + value.isoformat(' ') + "'"
+        if value_type is date:
+            return "'" + value.isoformat() + "'"
+        return escape(value)
+
+    return literal
+
+
+def _row_values(getter: Callable[[Dict[str, Any]], tuple], columns: Tuple[str, ...],
+                data_list: List[Dict[str, Any]]) -> List[tuple]:
+    """按列顺序提取每行的值; 存在缺列的行时回退到 dict.get, 缺失的列取 None。"""
+    try:
+        return list(map(getter, data_list))
+    except KeyError:
+        return [tuple(data.get(col) for col in columns) for data in data_list]
 
-    @functools.wraps(func)
-    def wrapper(self, *args, **kwargs):
+
+class _ConnectionPool:
+    """
+    一个有界的线程安全连接池。
+    借出连接时, 对空闲超过 ping_interval 秒的连接做一次健康检查, 失效的连接会被丢弃并重新创建;
+    池中连接总数 (空闲 + 借出) 不超过 max_size, 用尽时借出方最多等待 timeout 秒。
+    """
+
+    def __init__(self, factory: Callable[[], pymysql.connections.Connection], max_size: int = 5,
+                 timeout: float = 30, ping_interval: float = 30):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._idle: deque = deque()  # (connection, 归还时间)
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _healthy(self, conn: pymysql.connections.Connection, idle_since: float) -> bool:
+        if not conn.open:
+            return False
+        if time.monotonic() - idle_since < self.ping_interval:
+            return True
         try:
-            self.connection.ping(reconnect=True)
-            return func(self, *args, **kwargs)
+            conn.ping(reconnect=False)
+            return True
+        except pymysql.MySQLError:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: pymysql.connections.Connection):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self) -> pymysql.connections.Connection:
+        """借出一个可用连接, 池已满且在 timeout 内没有连接归还时抛出 TimeoutError。"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("[MySQLManager] 连接池已关闭。")
+                    if self._idle:
+                        conn, idle_since = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn, idle_since = None, 0.0
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"[MySQLManager] 等待空闲连接超时 ({self.timeout}s), 连接池大小: {self.max_size}。")
+                    self._condition.wait(remaining)
+
+            if conn is not None:
+                if self._healthy(conn, idle_since):
+                    return conn
+                self._close_quietly(conn)
+            # 在锁外创建连接, 避免阻塞其他线程归还/借出
+            try:
+                return self._factory()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+
+    def add(self, conn: pymysql.connections.Connection):
+        """将一个外部创建的连接直接放入池中 (超出上限时关闭)。"""
+        with self._condition:
+            if self._closed or self._size >= self.max_size:
+                self._close_quietly(conn)
+                return
+            self._size += 1
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def release(self, conn: pymysql.connections.Connection, discard: bool = False):
+        """归还连接; discard 为 True 或连接已断开时直接关闭并释放名额。"""
+        with self._condition:
+            if discard or self._closed or not conn.open:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """以上下文管理器的方式借出连接, 发生连接类错误时丢弃该连接。"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
         except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
-            print(f"[MySQLManager] 连接已丢失或操作期间连接断开: {e}。将再次尝试重连并执行操作。")
-            self.reconnect()
-            return func(self, *args, **kwargs)
+            discard = _is_connection_failure(e)
+            raise
+        finally:
+            self.release(conn, discard)
 
-    return wrapper
+    def close_all(self):
+        """关闭所有空闲连接, 借出中的连接在归还时关闭。"""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                self._close_quietly(conn)
+            self._condition.notify_all()
 
 
 class MysqlManager(BaseWriter):
@@ -33,121 +214,377 @@ class MysqlManager(BaseWriter):
     一个用于管理pymysql数据库连接和执行批量操作的类。
     这是 BaseWriter 的一个具体实现，用于写入MySQL数据库。
     此版本增加了健壮的自动重连机制。
+    读写操作通过有界连接池 (self.pool) 进行, 多个线程并发调用 upsert_batch 时各自借用独立的连接;
+    self.connection 仍然保留, 供直接使用游标的旧代码按需懒加载一个独立连接。
     """
 
     def __init__(self, host: str, user: str, password: str, database: str, port: int = 3306,
-                 max_retries: int = 999, retry_delay: int = 2):
+                 max_retries: int = 999, retry_delay: int = 2, pool_size: int = 5, pool_timeout: float = 30,
+                 ping_interval: float = 30, bulk_insert: bool = False, bulk_max_bytes: int = 4 * 1024 * 1024,
+                 connect_options: Optional[Dict[str, Any]] = None, max_retry_delay: float = 60,
+                 circuit_failure_threshold: int = 5, circuit_reset_timeout: float = 30,
+                 circuit_max_wait: float = 600):
         """
         初始化数据库管理器。
         :param max_retries: 最大重连尝试次数。
-        :param retry_delay: 初始重连延迟（秒），后续会指数增加。
+        :param retry_delay: 初始重连延迟（秒），后续按指数增加并带随机抖动。
+        :param max_retry_delay: 单次重连等待的上限（秒）。
+        :param pool_size: 连接池中连接数的上限。
+        :param pool_timeout: 连接池用尽时等待空闲连接的最长时间（秒）。
+        :param ping_interval: 连接空闲超过该秒数后, 借出前先 ping 检查其是否可用。
+        :param bulk_insert: 为 True 时 upsert_batch 直接拼接多行 VALUES 语句, 不再经过 executemany。
+        :param bulk_max_bytes: 多行 VALUES 模式下单条语句的字节上限, 同时不会超过服务端的 max_allowed_packet。
+        :param connect_options: 额外传给 pymysql.connect 的参数 (如 local_infile)。
+        :param circuit_failure_threshold: 连续连接失败多少次后熔断; 熔断期间不再尝试连接, 直接抛出 CircuitOpenError。
+        :param circuit_reset_timeout: 熔断持续的秒数, 到期后放行一次探测连接。
+        :param circuit_max_wait: 熔断期间调用方 (GenericFileProcessor / 数据库迁移) 为同一批次暂停等待的总秒数上限,
+                                 超过后抛出 ConnectionError。
         """
         self.db_config = {
             'host': host, 'user': user, 'password': password, 'database': database,
             'port': port, 'charset': 'utf8mb4', 'cursorclass': pymysql.cursors.DictCursor,
             'connect_timeout': 10
         }
+        if connect_options:
+            self.db_config.update(connect_options)
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.connection: Optional[pymysql.connections.Connection] = None
-        self._connect()  # 初始连接
+        self.max_retry_delay = max_retry_delay
+        self.circuit = CircuitBreaker(circuit_failure_threshold, circuit_reset_timeout)
+        self.circuit_max_wait = circuit_max_wait
+        self.bulk_insert = bulk_insert
+        self.bulk_max_bytes = bulk_max_bytes
+        self._max_allowed_packet: Optional[int] = None
+        self._connection: Optional[pymysql.connections.Connection] = None
+        self.pool = _ConnectionPool(self._create_pooled_connection, max_size=pool_size, timeout=pool_timeout,
+                                    ping_interval=ping_interval)
+        # 初始连接: 预先放入一个池连接, 保持原有的 "连接成功/失败" 提示
+        try:
+            self.pool.add(pymysql.connect(**self.db_config))
+            print("[MySQLManager] 数据库连接成功。")
+        except pymysql.MySQLError as e:
+            print(f"[MySQLManager] 数据库连接失败: {e}")
+
+    @property
+    def connection(self) -> Optional[pymysql.connections.Connection]:
+        """供旧代码直接使用的独立连接, 首次访问时才建立。"""
+        if self._connection is None:
+            self._connect()
+        return self._connection
+
+    @connection.setter
+    def connection(self, value: Optional[pymysql.connections.Connection]):
+        self._connection = value
 
     def _connect(self) -> None:
         """内部方法，用于建立数据库连接。"""
         try:
-            self.connection = pymysql.connect(**self.db_config)
-            print("[MySQLManager] 数据库连接成功。")
+            self._connection = pymysql.connect(**self.db_config)
         except pymysql.MySQLError as e:
             print(f"[MySQLManager] 数据库连接失败: {e}")
-            self.connection = None
+            self._connection = None
 
-    def reconnect(self) -> None:
+    def _connect_with_retry(self) -> pymysql.connections.Connection:
+        """
+        建立一个新连接, 失败时按带抖动的指数退避重试 (单次等待不超过 max_retry_delay 秒)。
+        连续失败达到熔断阈值后抛出 CircuitOpenError, 由调用方决定暂停多久, 而不是在写入器内部长时间阻塞。
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            self.circuit.before_attempt()
+            try:
+                conn = pymysql.connect(**self.db_config)
+            except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+                last_error = e
+                self.circuit.record_failure()
+                if self.circuit.state != CLOSED:
+                    retry_after = self.circuit.retry_after()
+                    print(f"[MySQLManager] 连续 {self.circuit.failures} 次连接失败: {e}。连接已熔断, {retry_after:.1f} 秒内不再尝试。")
+                    raise CircuitOpenError(f"[MySQLManager] 数据库连接已熔断: {e}", retry_after) from e
+                if attempt < self.max_retries:
+                    delay = backoff_delay(attempt, self.retry_delay, self.max_retry_delay)
+                    print(f"[MySQLManager] 连接失败: {e}。第 {attempt + 1}/{self.max_retries} 次尝试重连... 将在 {delay:.1f} 秒后重试。")
+                    time.sleep(delay)
+                continue
+            self.circuit.record_success()
+            return conn
+        raise ConnectionError(f"[MySQLManager] 无法重新连接到数据库，已达到最大尝试次数 ({self.max_retries})。最后的错误: {last_error}")
+
+    def _create_pooled_connection(self) -> pymysql.connections.Connection:
+        """为连接池创建新连接, 失败时按退避策略重试。"""
+        return self._connect_with_retry()
+
+    def _run_pooled(self, operation: Callable[[pymysql.connections.Connection], Any]) -> Any:
         """
-        执行重连逻辑，包含多次尝试和指数退避。
+        借出一个连接执行 operation(conn)。
+        借出时只对空闲超过 ping_interval 秒的连接 ping 一次 (见 _ConnectionPool);
+        连接类错误时该连接被丢弃, 换一个新连接 (必要时重连) 再执行一次;
+        其余数据库错误 (数据错误、锁等待超时等) 直接抛出。
         """
-        if self.connection:
+        try:
+            with self.pool.connection() as conn:
+                return operation(conn)
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+            if not _is_connection_failure(e):
+                raise
+            print(f"[MySQLManager] 连接已丢失或操作期间连接断开: {e}。将再次尝试重连并执行操作。")
+            with self.pool.connection() as conn:
+                return operation(conn)
+
+    @property
+    def circuit_state(self) -> str:
+        """连接熔断器的状态: 'closed' (正常), 'open' (熔断中), 'half_open' (允许一次探测)。"""
+        return self.circuit.state
+
+    def is_available(self) -> bool:
+        """当前是否允许尝试写入; 熔断期间返回 False, 调用方可以暂停读取并在 retry_after() 秒后再试。"""
+        return self.circuit.state != OPEN
+
+    def retry_after(self) -> float:
+        """距离熔断结束的秒数, 未熔断时为 0。"""
+        return self.circuit.retry_after()
+
+    @staticmethod
+    def _end_read(conn: pymysql.connections.Connection):
+        """结束只读事务, 避免连接在池中长期持有旧的一致性快照。"""
+        if conn.open:
             try:
-                self.connection.close()
+                conn.rollback()
             except pymysql.MySQLError:
-                pass  # 如果连接已经失效，关闭时可能会出错，忽略即可
-        self.connection = None
+                pass
 
-        for i in range(self.max_retries):
-            delay = self.retry_delay * (2 ** i)
-            print(f"[MySQLManager] 第 {i + 1}/{self.max_retries} 次尝试重连... 将在 {delay} 秒后重试。")
-            time.sleep(delay)
-            self._connect()
-            if self.is_connected():
-                return
+    def fetch_all(self, sql: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
+        """执行查询并返回所有结果行。"""
+
+        def operation(conn):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+            finally:
+                self._end_read(conn)
 
-        # 如果所有尝试都失败了，则抛出异常
-        raise ConnectionError(f"[MySQLManager] 无法重新连接到数据库，已达到最大尝试次数 ({self.max_retries})。")
+        return list(self._run_pooled(operation))
+
+    def fetch_one(self, sql: str, params: Optional[Tuple] = None) -> Optional[Dict[str, Any]]:
+        """执行查询并返回第一行结果, 没有结果时返回 None。"""
+
+        def operation(conn):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchone()
+            finally:
+                self._end_read(conn)
+
+        return self._run_pooled(operation)
+
+    def fetch_rows(self, sql: str, params: Optional[Tuple] = None) -> List[tuple]:
+        """执行查询并以元组列表返回所有结果行 (按 SELECT 的列顺序), 不构造字典。"""
+
+        def operation(conn):
+            try:
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+            finally:
+                self._end_read(conn)
+
+        return list(self._run_pooled(operation))
+
+    def stream_rows(self, sql: str, params: Optional[Tuple] = None,
+                    chunk_size: int = 1000) -> Iterator[Tuple[tuple, List[tuple]]]:
+        """
+        以服务端游标 (SSCursor) 流式执行查询, 每次产出 (cursor.description, 最多 chunk_size 行的元组列表)。
+        结果集不会整体加载到客户端内存, 也不会构造字典。
+        迭代期间独占一个池连接, 迭代结束或生成器被关闭时归还; 流式读取无法透明重试, 连接中断时异常直接抛给调用方。
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                cursor.execute(sql, params)
+                description = cursor.description
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield description, rows
+            finally:
+                # 提前结束时 close 会读完剩余结果, 使连接可以继续使用
+                cursor.close()
+                self._end_read(conn)
+
+    def execute(self, sql: str, params: Optional[Tuple] = None, commit: bool = False) -> int:
+        """
+        执行一条语句并返回受影响的行数。
+        commit 为 False 时回滚, 使归还到池中的连接不带有未提交的事务。
+        """
+
+        def operation(conn):
+            try:
+                with conn.cursor() as cursor:
+                    affected = cursor.execute(sql, params)
+                if commit:
+                    conn.commit()
+                else:
+                    conn.rollback()
+                return affected
+            except pymysql.MySQLError:
+                conn.rollback()
+                raise
+
+        return self._run_pooled(operation)
+
+    def close_pool(self):
+        """关闭连接池以及旧代码使用的独立连接。"""
+        self.pool.close_all()
+        if self.is_connected():
+            self._connection.close()
+            self._connection = None
+        print("[MySQLManager] 数据库连接池已关闭。")
+
+    def reconnect(self) -> None:
+        """
+        重建独立连接, 包含多次尝试、带抖动的指数退避以及熔断。
+        """
+        if self._connection:
+            try:
+                self._connection.close()
+            except pymysql.MySQLError:
+                pass  # 如果连接已经失效，关闭时可能会出错，忽略即可
+        self._connection = None
+        self._connection = self._connect_with_retry()
 
     def is_connected(self) -> bool:
-        """检查当前是否已成功连接到数据库。"""
-        return self.connection is not None and self.connection.open
+        """检查当前是否已成功连接到数据库 (独立连接已打开, 或连接池中持有连接)。"""
+        return (self._connection is not None and self._connection.open) or self.pool.size > 0
 
     def close(self):
         """关闭数据库连接。"""
         if self.is_connected():
-            self.connection.close()
-            self.connection = None
+            self.pool.close_all()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
             print("[MySQLManager] 数据库连接已主动关闭。")
 
-    @ensure_connection
+    def _bulk_byte_budget(self) -> int:
+        """多行 VALUES 语句的字节预算: bulk_max_bytes 与服务端 max_allowed_packet (只查询一次) 中的较小者。"""
+        if self._max_allowed_packet is None:
+            try:
+                result = self.fetch_one("SELECT @@max_allowed_packet AS max_allowed_packet")
+                self._max_allowed_packet = int(result['max_allowed_packet'])
+            except (pymysql.MySQLError, TypeError, KeyError, ValueError) as e:
+                print(f"[MySQLManager] 无法获取 max_allowed_packet, 将使用 bulk_max_bytes: {e}")
+                self._max_allowed_packet = self.bulk_max_bytes
+        # 预留一部分空间给协议包头
+        return max(1024, min(self.bulk_max_bytes, self._max_allowed_packet - 1024))
+
+    def _bulk_upsert(self, table_name: str, columns: Tuple[str, ...], rows: Sequence[tuple],
+                     test: bool = False) -> bool:
+        """
+        以多行 VALUES (...),(...) 语句写入, 按字节预算切分为多条语句, 在同一个事务中执行。
+        单行超过预算时单独成句, 由服务端决定是否接受。
+        """
+        prefix, suffix = _bulk_statement_parts(table_name, columns)
+        budget = self._bulk_byte_budget()
+        fixed_size = len(prefix.encode('utf-8')) + len(suffix.encode('utf-8'))
+
+        def operation(conn):
+            literal = _make_literal(conn)
+            try:
+                with conn.cursor() as cursor:
+                    chunk, chunk_size = [], fixed_size
+                    for row in rows:
+                        row_sql = '(' + ','.join(map(literal, row)) + ')'
+                        row_size = (len(row_sql) if row_sql.isascii() else len(row_sql.encode('utf-8'))) + 1
+                        if chunk and chunk_size + row_size > budget:
+                            cursor.execute(prefix + ','.join(chunk) + suffix)
+                            chunk, chunk_size = [], fixed_size
+                        chunk.append(row_sql)
+                        chunk_size += row_size
+                    if chunk:
+                        cursor.execute(prefix + ','.join(chunk) + suffix)
+                if not test:
+                    conn.commit()
+                else:
+                    conn.rollback()
+                return True
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                raise e
+
+        return self._run_pooled(operation)
+
+    def upsert_tuples(self, table_name: str, columns: Sequence[str], rows: Sequence[tuple],
+                      test: bool = False) -> bool:
+        """
+        写入按 columns 顺序排列的元组行 (如 stream_rows 的结果), 语义与 upsert_batch 相同, 但不需要构造字典。
+        bulk_insert 为 True 时使用多行 VALUES 模式。
+        """
+        if not rows:
+            return True
+        columns = tuple(columns)
+        if self.bulk_insert:
+            return self._bulk_upsert(table_name, columns, rows, test)
+
+        sql, _ = _upsert_statement(table_name, columns)
+
+        def operation(conn):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.executemany(sql, rows)
+                if not test:
+                    conn.commit()
+                else:
+                    # 测试模式下不提交, 回滚后再归还连接, 避免被后续操作顺带提交
+                    conn.rollback()
+                return True
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                raise e
+
+        return self._run_pooled(operation)
+
     def upsert_batch(self, data_list: List[Dict[str, Any]], table_name: str, test: bool = False) -> bool:
         """
         将数据字典列表批量插入或更新到数据库中 (Upsert)。
-        此方法现在受自动重连机制保护。
+        此方法从连接池借用连接执行, 并受自动重连机制保护。
+        bulk_insert 为 True 时使用多行 VALUES 模式。
         """
         if not data_list:
             return True
 
-        columns = list(data_list[0].keys())
-        update_columns = [col for col in columns if col.lower() not in ['id', 'create_time']]
-        sql = f"""
-            INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)})
-            VALUES ({', '.join(['%s'] * len(columns))})
-            ON DUPLICATE KEY UPDATE {', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)}
-        """
-        values = [tuple(data.get(col) for col in columns) for data in data_list]
-
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.executemany(sql, values)
-            if not test:
-                self.connection.commit()
-            return True
-        except pymysql.MySQLError as e:
-            self.connection.rollback()
-            raise e
+        columns = tuple(data_list[0])
+        _, getter = _upsert_statement(table_name, columns)
+        return self.upsert_tuples(table_name, columns, _row_values(getter, columns, data_list), test)
 
-    @ensure_connection
     def upsert_single(self, data_dict: Dict[str, Any], table_name: str, test: bool = False) -> bool:
         """
         将单个数据字典插入或更新到数据库中。
-        此方法现在受自动重连机制保护。
+        此方法从连接池借用连接执行, 并受自动重连机制保护。
         """
         if not data_dict:
             return True
 
-        columns = list(data_dict.keys())
-        update_columns = [col for col in columns if col.lower() not in ['id', 'create_time']]
-        sql = f"""
-            INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in columns)})
-            VALUES ({', '.join(['%s'] * len(columns))})
-            ON DUPLICATE KEY UPDATE {', '.join(f'`{col}` = VALUES(`{col}`)' for col in update_columns)}
-        """
-        values = tuple(data_dict.get(col) for col in columns)
+        columns = tuple(data_dict)
+        sql, getter = _upsert_statement(table_name, columns)
+        values = getter(data_dict)
 
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(sql, values)
-            if not test: self.connection.commit()
-            return True
-        except pymysql.MySQLError as e:
-            self.connection.rollback()
-            raise e
+        def operation(conn):
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, values)
+                if not test:
+                    conn.commit()
+                else:
+                    conn.rollback()
+                return True
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                raise e
+
+        return self._run_pooled(operation)
 
     def __enter__(self):
         return self
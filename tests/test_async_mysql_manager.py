@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+
+from mignonFramework.utils.writer.AsyncMySQLManager import AsyncMySQLManager
+
+
+class _FakeConnection:
+    def close(self):
+        pass
+
+
+class _Acquire:
+    async def __aenter__(self):
+        await asyncio.sleep(0)
+        return _FakeConnection()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakePool:
+    def acquire(self):
+        return _Acquire()
+
+
+def _make_manager(max_in_flight):
+    manager = AsyncMySQLManager.__new__(AsyncMySQLManager)
+    manager.max_in_flight = max_in_flight
+    manager._pool = _FakePool()
+    manager._in_flight = asyncio.Semaphore(max_in_flight)
+    return manager
+
+
+class RunPooledInFlightTest(unittest.TestCase):
+
+    def test_reconnect_retry_stays_within_max_in_flight(self):
+        async def scenario():
+            manager = _make_manager(max_in_flight=2)
+            active, peak, attempts = 0, 0, {}
+
+            async def operation(task_id):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                try:
+                    await asyncio.sleep(0.01)
+                    attempts[task_id] = attempts.get(task_id, 0) + 1
+                    if attempts[task_id] == 1:
+                        raise ConnectionError("server has gone away")
+                    return task_id
+                finally:
+                    active -= 1
+
+            results = await asyncio.gather(*(
+                manager._run_pooled(lambda conn, i=i: operation(i)) for i in range(10)))
+            return results, peak, attempts
+
+        results, peak, attempts = asyncio.run(scenario())
+        self.assertEqual(results, list(range(10)))
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(set(attempts.values()), {2})
+
+    def test_second_connection_error_is_raised(self):
+        async def scenario():
+            manager = _make_manager(max_in_flight=1)
+
+            async def operation(conn):
+                raise ConnectionError("down")
+
+            await manager._run_pooled(operation)
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from mignonFramework.utils.writer.CircuitBreaker import CircuitOpenError, call_when_available
+
+
+class _BrokenWriter:
+    """数据库持续不可用: 每次调用都因熔断被拒绝。"""
+
+    def __init__(self, max_wait):
+        self.circuit_max_wait = max_wait
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def retry_after(self):
+        return 0.0
+
+    def write(self):
+        self.calls += 1
+        raise CircuitOpenError("连接已熔断", 0.05)
+
+
+class CallWhenAvailableTest(unittest.TestCase):
+
+    def test_gives_up_after_max_wait(self):
+        writer = _BrokenWriter(max_wait=1.2)
+        with self.assertRaises(ConnectionError) as ctx:
+            call_when_available(writer, writer.write)
+        self.assertNotIsInstance(ctx.exception, CircuitOpenError)
+        self.assertGreater(writer.calls, 1)
+
+    def test_recovers_within_max_wait(self):
+        writer = _BrokenWriter(max_wait=5)
+        results = iter([CircuitOpenError("连接已熔断", 0.05), 'ok'])
+
+        def flaky():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.assertEqual(call_when_available(writer, flaky), 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
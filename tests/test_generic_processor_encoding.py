@@ -0,0 +1,28 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+from mignonFramework.utils.GenericProcessor import GenericFileProcessor, _encode_nested, orjson
+
+NESTED = {'a': [0, 1.5, float('nan')], 'b': {'c': '中文'}}
+
+
+class NestedEncodingTest(unittest.TestCase):
+
+    def test_default_matches_stdlib_json(self):
+        expected = json.dumps(NESTED, ensure_ascii=False)
+        self.assertEqual(_encode_nested(NESTED), expected)
+        processor = SimpleNamespace(compact_json=False)
+        self.assertEqual(GenericFileProcessor._finalize_types(processor, {'n': NESTED})['n'], expected)
+        rows = GenericFileProcessor._finalize_batch([({'n': NESTED, 's': ' '}, 1)])
+        self.assertEqual(rows, [({'n': expected, 's': None}, 1)])
+
+    @unittest.skipIf(orjson is None, "orjson 未安装")
+    def test_compact_opt_in_uses_orjson(self):
+        self.assertEqual(_encode_nested({'a': [0]}, compact=True), '{"a":[0]}')
+        rows = GenericFileProcessor._finalize_batch([({'n': {'a': [0]}}, 1)], compact_json=True)
+        self.assertEqual(rows[0][0]['n'], '{"a":[0]}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from mignonFramework.utils.GenericProcessor import (GenericFileProcessor, _PARSE_WORKER_ATTRIBUTES,
+                                                   _init_parse_worker)
+import mignonFramework.utils.GenericProcessor as generic_processor
+
+
+def _double(row):
+    return {'v': row['v'] * 2}
+
+
+def _make_processor(**attributes):
+    processor = GenericFileProcessor.__new__(GenericFileProcessor)
+    processor.__dict__.update(dict.fromkeys(_PARSE_WORKER_ATTRIBUTES), exclude_keys=set(), default_values={},
+                              batch_size=100, on_error='stop', modifier_stdout='row', compact_json=False,
+                              writer=object(), callBack=lambda *args: None)
+    processor.__dict__.update(attributes)
+    return processor
+
+
+class ParseWorkerStateTest(unittest.TestCase):
+
+    def test_state_only_carries_parse_attributes(self):
+        processor = _make_processor(modifier_function=_double)
+        with mock.patch.object(generic_processor.multiprocessing, 'get_start_method', return_value='spawn'):
+            state = processor._parse_worker_state()
+        self.assertEqual(set(state), set(_PARSE_WORKER_ATTRIBUTES))
+        _init_parse_worker(state)
+        rows, errors = generic_processor._WORKER_PROCESSOR._transform_rows([({'v': 2}, 1)])
+        self.assertEqual((rows, errors), ([({'v': 4}, 1)], []))
+
+    def test_unpicklable_argument_is_named(self):
+        processor = _make_processor(filter_function=lambda row, line_num: True)
+        with mock.patch.object(generic_processor.multiprocessing, 'get_start_method', return_value='spawn'):
+            with self.assertRaisesRegex(TypeError, 'filter_function'):
+                processor._parse_worker_state()
+
+    def test_fork_does_not_require_pickling(self):
+        processor = _make_processor(modifier_function=lambda row: row)
+        with mock.patch.object(generic_processor.multiprocessing, 'get_start_method', return_value='fork'):
+            self.assertIn('modifier_function', processor._parse_worker_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
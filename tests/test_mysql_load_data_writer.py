@@ -0,0 +1,116 @@
+import unittest
+
+import pymysql
+
+from mignonFramework.utils.writer.ErrorIsolation import SKIP, bisect_write
+from mignonFramework.utils.writer.MySQLLoadDataWriter import MySQLLoadDataWriter
+
+NAME_LENGTH = 8
+
+
+class _FakeCursor:
+    """模拟 LOAD DATA LOCAL 的行为: name 超长时截断写入并产生警告, 而不是报错。"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.warning_count = 0
+        self._rows = []
+
+    def execute(self, sql):
+        if sql == "SHOW WARNINGS":
+            self._rows = list(self.conn.last_warnings)
+            return
+        path = sql.split("INFILE ")[1].split(" ")[0].strip("'")
+        warnings = []
+        with open(path, encoding='utf-8') as f:
+            for line_num, line in enumerate(f, start=1):
+                row_id, name = line.rstrip('\n').split('\t')
+                if row_id in self.conn.committed or row_id in self.conn.staged:
+                    if 'IGNORE' in sql:
+                        warnings.append({'Level': 'Warning', 'Code': 1062, 'Message': f"Duplicate entry '{row_id}'"})
+                        continue
+                if len(name) > NAME_LENGTH:
+                    warnings.append({'Level': 'Warning', 'Code': 1265,
+                                     'Message': f"Data truncated for column 'name' at row {line_num}"})
+                self.conn.staged[row_id] = name[:NAME_LENGTH]
+        self.conn.last_warnings = warnings
+        self.warning_count = len(warnings)
+
+    def fetchall(self):
+        return self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.committed = {}
+        self.staged = {}
+        self.last_warnings = []
+
+    def escape(self, value):
+        return f"'{value}'"
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.committed.update(self.staged)
+        self.staged.clear()
+
+    def rollback(self):
+        self.staged.clear()
+
+
+def _make_writer(mode='replace'):
+    writer = MySQLLoadDataWriter.__new__(MySQLLoadDataWriter)
+    writer.mode = mode
+    writer.temp_dir = None
+    writer._load_data_disabled = False
+    conn = _FakeConnection()
+    writer._run_pooled = lambda operation: operation(conn)
+    return writer, conn
+
+
+class MySQLLoadDataWriterWarningTest(unittest.TestCase):
+
+    def test_clean_batch_is_committed(self):
+        writer, conn = _make_writer()
+        self.assertTrue(writer.upsert_tuples('t', ('id', 'name'), [(1, 'short'), (2, 'also')]))
+        self.assertEqual(conn.committed, {'1': 'short', '2': 'also'})
+
+    def test_too_long_value_rolls_back_and_raises(self):
+        writer, conn = _make_writer()
+        with self.assertRaises(pymysql.err.DataError) as ctx:
+            writer.upsert_tuples('t', ('id', 'name'), [(1, 'short'), (2, 'much too long')])
+        self.assertEqual(ctx.exception.args[0], 1265)
+        self.assertEqual(conn.committed, {})
+
+    def test_bisect_isolates_too_long_row(self):
+        writer, conn = _make_writer()
+        rows = [(i, 'much too long' if i == 3 else f'ok{i}') for i in range(1, 7)]
+        failed = []
+
+        def write_batch(chunk):
+            writer.upsert_tuples('t', ('id', 'name'), chunk)
+
+        with self.assertRaises(pymysql.err.DataError):
+            write_batch(rows)
+        bisect_write(rows, write_batch, lambda row: write_batch([row]),
+                     on_row_error=lambda row, e: failed.append(row) or SKIP)
+        self.assertEqual(failed, [(3, 'much too long')])
+        self.assertEqual(sorted(conn.committed), ['1', '2', '4', '5', '6'])
+
+    def test_duplicate_warnings_are_expected_in_ignore_mode(self):
+        writer, conn = _make_writer(mode='ignore')
+        writer.upsert_tuples('t', ('id', 'name'), [(1, 'first')])
+        self.assertTrue(writer.upsert_tuples('t', ('id', 'name'), [(1, 'second'), (2, 'new')]))
+        self.assertEqual(conn.committed, {'1': 'first', '2': 'new'})
+
+
+if __name__ == '__main__':
+    unittest.main()
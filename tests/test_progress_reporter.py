@@ -0,0 +1,36 @@
+import io
+import unittest
+
+from mignonFramework.utils.utilClass.ProgressReporter import ProgressReporter
+
+
+class ProgressReporterCloseTest(unittest.TestCase):
+
+    def test_close_does_not_repeat_final_render(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(10, stream=stream)
+        for i in range(1, 11):
+            reporter.update(i, "本批: [0]")
+        reporter.close()
+        self.assertEqual(stream.getvalue().count('100.0%'), 1)
+        self.assertTrue(stream.getvalue().endswith('\n'))
+
+    def test_close_renders_unshown_state(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(10, min_interval=60, stream=stream)
+        reporter.update(1)
+        reporter.update(5)
+        reporter.close()
+        self.assertIn('(5/10)', stream.getvalue())
+
+    def test_close_renders_new_suffix(self):
+        stream = io.StringIO()
+        reporter = ProgressReporter(10, stream=stream)
+        reporter.update(10, "本批: [3/5]")
+        reporter.close("本批: [0/5]")
+        self.assertEqual(stream.getvalue().count('100.0%'), 2)
+        self.assertIn("本批: [0/5]", stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()